@@ -23,8 +23,21 @@ case "$1" in
     echo "End sqlMesh"
     ;;
   "ui")
-    # Start secure web interface instead of default SQLMesh UI
-    uv run python -m pipeline.secure_ui
+    # Start secure web interface instead of default SQLMesh UI, served by Gunicorn.
+    # Sessions live in each worker's memory unless REDIS_URL is set, so only
+    # scale out to multiple worker processes when they can share Redis.
+    if [ -n "$REDIS_URL" ]; then
+      default_workers=$((2 * $(nproc) + 1))
+    else
+      default_workers=1
+    fi
+    uv run gunicorn \
+      --worker-class gthread \
+      --workers "${GUNICORN_WORKERS:-$default_workers}" \
+      --threads "${GUNICORN_THREADS:-4}" \
+      --bind "0.0.0.0:${UI_PORT:-8080}" \
+      --access-logfile - \
+      pipeline.wsgi:app
     ;;
   "sqlmesh_ui")
     # Original SQLMesh UI (for internal use)
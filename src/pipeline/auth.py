@@ -4,113 +4,352 @@ This module provides secure authentication and authorization for the application
 including password protection, session management, and role-based access control.
 """
 
+import asyncio
+import base64
+import json
 import os
 import hashlib
+import hmac
 import secrets
+import threading
 import time
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+from datetime import datetime
 import jwt
 from functools import wraps
 import logging
 
-from pipeline.exceptions import AuthenticationError, AuthorizationError
+from pipeline.exceptions import AuthenticationError, AuthorizationError, ConfigurationError
+from pipeline.session_store import get_session_store
 
 logger = logging.getLogger(__name__)
 
+def load_or_create_secret(env_var: str, default_key_file: Path) -> str:
+    """Return a secret from the environment, or a persistent machine-local one outside production.
+    
+    A random per-process fallback would invalidate every issued token on restart, so in
+    production the environment variable is required. Elsewhere the secret is generated
+    once and kept in a 0600 key file (overridable via `<env_var>_FILE`). The file is
+    written under a temporary name and hard-linked into place, so concurrently starting
+    workers never read a partially written key.
+    
+    :raises ConfigurationError: If the secret is missing in production or empty
+    """
+    secret = os.getenv(env_var)
+    if secret is not None:
+        secret = secret.strip()
+        if not secret:
+            raise ConfigurationError(f"{env_var} is set but empty")
+        return secret
+    
+    if os.getenv('TARGET', 'dev').lower() == 'prod':
+        raise ConfigurationError(f"{env_var} must be set when TARGET is prod")
+    
+    key_path = Path(os.getenv(f'{env_var}_FILE', str(default_key_file)))
+    if not key_path.exists():
+        key_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = key_path.with_name(f".{key_path.name}.{os.getpid()}.{secrets.token_hex(4)}")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            with os.fdopen(fd, 'w') as key_file:
+                key_file.write(secrets.token_urlsafe(32))
+            # link() fails if another process already created the key; keep theirs
+            os.link(tmp_path, key_path)
+            logger.warning(f"{env_var} not set, generated a persistent key at {key_path}")
+        except FileExistsError:
+            pass
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    
+    secret = key_path.read_text().strip()
+    if not secret:
+        raise ConfigurationError(f"Key file {key_path} for {env_var} is empty")
+    return secret
+
 # Configuration
-SECRET_KEY = os.getenv('APP_SECRET_KEY', secrets.token_urlsafe(32))
+SECRET_KEY = load_or_create_secret('APP_SECRET_KEY', Path.home() / '.osaa' / 'app_secret_key')
+_SECRET_KEY_BYTES = SECRET_KEY.encode('utf-8')
 SESSION_TIMEOUT = int(os.getenv('SESSION_TIMEOUT_MINUTES', '480'))  # 8 hours default
 MAX_LOGIN_ATTEMPTS = int(os.getenv('MAX_LOGIN_ATTEMPTS', '5'))
 LOCKOUT_DURATION = int(os.getenv('LOCKOUT_DURATION_MINUTES', '30'))
+MAX_LOGIN_ATTEMPTS_PER_IP = int(os.getenv('MAX_LOGIN_ATTEMPTS_PER_IP', '20'))
+_SESSION_TIMEOUT_SECS = SESSION_TIMEOUT * 60
+_LOCKOUT_SECS = LOCKOUT_DURATION * 60
+
+# Session store: Redis when REDIS_URL is set, otherwise a bounded in-process TTL cache
+sessions = get_session_store(_SESSION_TIMEOUT_SECS)
 
-# In-memory session store (in production, use Redis or database)
-sessions: Dict[str, Dict[str, Any]] = {}
-login_attempts: Dict[str, Dict[str, Any]] = {}
+# Failed attempts per fixed LOCKOUT_DURATION window: (username, ip, bucket) and (ip, bucket)
+login_attempts: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+ip_login_attempts: Dict[Tuple[str, int], int] = {}
+
+# Running counters so get_security_status() does not scan login_attempts
+_failed_attempts_total = 0
+_locked_accounts_count = 0
+
+# Guards login_attempts, ip_login_attempts and the counters above; requests are
+# served from several threads
+_login_attempts_lock = threading.Lock()
 
 # Default admin credentials (should be changed in production)
 DEFAULT_ADMIN_USER = os.getenv('ADMIN_USERNAME', 'admin')
 DEFAULT_ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'ChangeThisPassword123!')
 
+class _RandomPool:
+    """Serves small random byte strings from one batched os.urandom() draw.
+    
+    The buffer is dropped in forked children so worker processes never share
+    random bytes drawn by their parent.
+    """
+    
+    def __init__(self, size: int = 4096):
+        self._size = size
+        self._buffer = b''
+        self._offset = 0
+        self._lock = threading.Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._buffer = b''
+        self._offset = 0
+    
+    def take(self, n: int) -> bytes:
+        """Return n cryptographically random bytes."""
+        if n > self._size:
+            return os.urandom(n)
+        with self._lock:
+            if self._offset + n > len(self._buffer):
+                self._buffer = os.urandom(self._size)
+                self._offset = 0
+            chunk = self._buffer[self._offset:self._offset + n]
+            self._offset += n
+            return chunk
+
+_RANDOM_POOL = _RandomPool()
+
+# Iteration count of hashes stored without one, and the floor for calibration
+_MIN_PBKDF2_ITERATIONS = 100000
+
+def _calibrate_pbkdf2_iterations(target_ms: int) -> int:
+    """Pick the PBKDF2 iteration count that takes about target_ms on this host."""
+    sample_iterations = 20000
+    started = time.perf_counter()
+    hashlib.pbkdf2_hmac('sha256', b'calibration', b'calibration-salt', sample_iterations)
+    elapsed_ms = max((time.perf_counter() - started) * 1000, 0.001)
+    iterations = int(sample_iterations * target_ms / elapsed_ms) // 10000 * 10000
+    return max(_MIN_PBKDF2_ITERATIONS, iterations)
+
+# New hashes use PASSWORD_HASH_ITERATIONS if set, otherwise as many iterations as
+# fit in PASSWORD_HASH_TARGET_MS on this host; the count is stored in each hash
+PBKDF2_ITERATIONS = int(
+    os.getenv('PASSWORD_HASH_ITERATIONS')
+    or _calibrate_pbkdf2_iterations(int(os.getenv('PASSWORD_HASH_TARGET_MS', '250')))
+)
+
 def hash_password(password: str) -> str:
-    """Hash password using SHA-256 with salt."""
-    salt = secrets.token_hex(16)
+    """Hash password using PBKDF2-SHA256 with salt; returns salt:hash:iterations."""
+    salt = _RANDOM_POOL.take(16).hex()
     password_hash = hashlib.pbkdf2_hmac('sha256', 
                                        password.encode('utf-8'), 
                                        salt.encode('utf-8'), 
-                                       100000)
-    return f"{salt}:{password_hash.hex()}"
+                                       PBKDF2_ITERATIONS)
+    return f"{salt}:{password_hash.hex()}:{PBKDF2_ITERATIONS}"
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify password against hash."""
+    """Verify password against hash (salt:hash, with an optional :iterations suffix)."""
     try:
-        salt, stored_hash = hashed_password.split(':')
+        salt, stored_hash, *iterations = hashed_password.split(':')
         password_hash = hashlib.pbkdf2_hmac('sha256',
                                            password.encode('utf-8'),
                                            salt.encode('utf-8'),
-                                           100000)
-        return password_hash.hex() == stored_hash
+                                           int(iterations[0]) if iterations else _MIN_PBKDF2_ITERATIONS)
+        return hmac.compare_digest(password_hash, bytes.fromhex(stored_hash))
     except Exception as e:
         logger.error(f"Password verification error: {e}")
         return False
 
+# PBKDF2 releases the GIL, so a thread pool keeps it off the event loop
+_pbkdf2_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='pbkdf2')
+
+async def ahash_password(password: str) -> str:
+    """Hash password without blocking the running event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pbkdf2_pool, hash_password, password)
+
+async def averify_password(password: str, hashed_password: str) -> bool:
+    """Verify password against hash without blocking the running event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pbkdf2_pool, verify_password, password, hashed_password)
+
+# Precomputed once so logins do not pay an extra PBKDF2 run to hash the default password
+_ADMIN_HASH = hash_password(DEFAULT_ADMIN_PASSWORD)
+_ADMIN_USER_BYTES = DEFAULT_ADMIN_USER.encode('utf-8')
+
+# Checked instead of a real hash for unknown usernames, so a failed login costs the
+# same PBKDF2 run whether or not the account exists; no password matches it
+_DUMMY_HASH = f"{_RANDOM_POOL.take(16).hex()}:{'00' * 32}:{PBKDF2_ITERATIONS}"
+
+# Recent successful verifications keyed by (SHA-256 of candidate, stored hash), never
+# plaintext. Failures are not cached: that would make repeated guesses free, and since
+# unknown users share _DUMMY_HASH, a cached failure would reveal the username is unknown
+_VERIFY_CACHE_SIZE = 1024
+_verify_cache: "OrderedDict[Tuple[bytes, str], None]" = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+def _verify_cached(password: str, hashed_password: str) -> bool:
+    """Verify password against hash, skipping PBKDF2 for a recently verified correct password."""
+    if hashed_password is _DUMMY_HASH:
+        return verify_password(password, hashed_password)
+    
+    key = (hashlib.sha256(password.encode('utf-8')).digest(), hashed_password)
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            _verify_cache.move_to_end(key)
+            return True
+    
+    if not verify_password(password, hashed_password):
+        return False
+    
+    with _verify_cache_lock:
+        _verify_cache[key] = None
+        if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+    return True
+
+def _current_bucket(now: float) -> int:
+    """Return the id of the fixed rate-limit window containing `now`."""
+    return int(now // _LOCKOUT_SECS)
+
+def _discard_login_attempts(key: Tuple[str, str, int]):
+    """Remove a login_attempts entry and roll back its contribution to the counters.
+    
+    Callers must hold _login_attempts_lock.
+    """
+    global _failed_attempts_total, _locked_accounts_count
+    info = login_attempts.pop(key, None)
+    if info is None:
+        return
+    _failed_attempts_total -= info['count']
+    if info['count'] >= MAX_LOGIN_ATTEMPTS:
+        _locked_accounts_count -= 1
+
+# Stale login_attempts entries are swept at most this often
+LOGIN_ATTEMPTS_PRUNE_INTERVAL = 300
+_last_prune_ts = 0.0
+
+def _prune_login_attempts(now: float):
+    """Drop login attempt records from windows that have already ended.
+    
+    Callers must hold _login_attempts_lock.
+    """
+    global _last_prune_ts
+    if now - _last_prune_ts < LOGIN_ATTEMPTS_PRUNE_INTERVAL:
+        return
+    _last_prune_ts = now
+    
+    bucket = _current_bucket(now)
+    stale_keys = [key for key in login_attempts if key[2] < bucket]
+    for key in stale_keys:
+        _discard_login_attempts(key)
+    
+    for ip_key in [ip_key for ip_key in ip_login_attempts if ip_key[1] < bucket]:
+        del ip_login_attempts[ip_key]
+    
+    if stale_keys:
+        logger.info(f"Pruned {len(stale_keys)} stale login attempt records")
+
 def check_login_attempts(username: str, ip_address: str) -> bool:
-    """Check if user is locked out due to too many failed attempts."""
-    key = f"{username}:{ip_address}"
+    """Check if user or IP has used up its failed attempts for the current window."""
     now = time.time()
+    bucket = _current_bucket(now)
+    with _login_attempts_lock:
+        _prune_login_attempts(now)
+        attempts_info = login_attempts.get((username, ip_address, bucket))
+        user_locked = attempts_info is not None and attempts_info['count'] >= MAX_LOGIN_ATTEMPTS
+        ip_locked = ip_login_attempts.get((ip_address, bucket), 0) >= MAX_LOGIN_ATTEMPTS_PER_IP
     
-    if key in login_attempts:
-        attempts_info = login_attempts[key]
-        
-        # Check if still locked out
-        if now - attempts_info['last_attempt'] < (LOCKOUT_DURATION * 60):
-            if attempts_info['count'] >= MAX_LOGIN_ATTEMPTS:
-                logger.warning(f"User {username} from {ip_address} is locked out")
-                return False
+    if user_locked:
+        logger.warning(f"User {username} from {ip_address} is locked out")
+        return False
+    
+    if ip_locked:
+        logger.warning(f"IP address {ip_address} is locked out")
+        return False
     
     return True
 
 def record_login_attempt(username: str, ip_address: str, success: bool):
     """Record login attempt for security monitoring."""
-    key = f"{username}:{ip_address}"
+    global _failed_attempts_total, _locked_accounts_count
     now = time.time()
+    bucket = _current_bucket(now)
+    key = (username, ip_address, bucket)
     
-    if success:
-        # Clear failed attempts on successful login
-        if key in login_attempts:
-            del login_attempts[key]
-    else:
-        # Record failed attempt
-        if key not in login_attempts:
-            login_attempts[key] = {'count': 0, 'last_attempt': now}
-        
-        login_attempts[key]['count'] += 1
-        login_attempts[key]['last_attempt'] = now
+    with _login_attempts_lock:
+        _prune_login_attempts(now)
+        if success:
+            # Clear failed attempts on successful login
+            _discard_login_attempts(key)
+        else:
+            # Record failed attempt
+            if key not in login_attempts:
+                login_attempts[key] = {'count': 0, 'last_attempt': now}
+            
+            login_attempts[key]['count'] += 1
+            login_attempts[key]['last_attempt'] = now
+            ip_key = (ip_address, bucket)
+            ip_login_attempts[ip_key] = ip_login_attempts.get(ip_key, 0) + 1
+            
+            _failed_attempts_total += 1
+            if login_attempts[key]['count'] == MAX_LOGIN_ATTEMPTS:
+                _locked_accounts_count += 1
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+# The HS256 header never changes, so its encoded segment is built once
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+def _encode_session_token(payload: Dict[str, Any]) -> str:
+    """Encode an HS256 JWT for a payload of plain JSON values.
+    
+    Equivalent to jwt.encode(payload, SECRET_KEY, algorithm='HS256') without PyJWT's
+    per-call header handling and claim inspection; tokens are still decoded with PyJWT.
+    """
+    signing_input = _JWT_HEADER_B64 + b'.' + _b64url(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+    signature = hmac.new(_SECRET_KEY_BYTES, signing_input, hashlib.sha256).digest()
+    return (signing_input + b'.' + _b64url(signature)).decode('ascii')
 
 def create_session(username: str, ip_address: str) -> str:
     """Create a new user session."""
-    session_id = secrets.token_urlsafe(32)
-    expires_at = datetime.utcnow() + timedelta(minutes=SESSION_TIMEOUT)
+    session_id = _RANDOM_POOL.take(16).hex()
+    now = time.time()
+    expires_at = now + _SESSION_TIMEOUT_SECS
     
     # Create JWT token
     payload = {
         'username': username,
         'session_id': session_id,
         'ip_address': ip_address,
-        'exp': expires_at,
-        'iat': datetime.utcnow()
+        'exp': int(expires_at),
+        'iat': int(now)
     }
     
-    token = jwt.encode(payload, SECRET_KEY, algorithm='HS256')
+    token = _encode_session_token(payload)
     
     # Store session
-    sessions[session_id] = {
+    sessions.set(session_id, {
         'username': username,
         'ip_address': ip_address,
-        'created_at': datetime.utcnow(),
-        'expires_at': expires_at,
-        'last_activity': datetime.utcnow()
-    }
+        'created_at_ts': now,
+        'expires_at_ts': expires_at,
+        'last_activity_ts': now
+    }, _SESSION_TIMEOUT_SECS)
     
     logger.info(f"Session created for user {username} from {ip_address}")
     return token
@@ -127,29 +366,30 @@ def validate_session(token: str, ip_address: str) -> Optional[Dict[str, Any]]:
         if not session_id or not username:
             return None
         
-        # Check if session exists and is valid
-        if session_id not in sessions:
+        # Check if session exists and is valid (a logged-out session is gone from the store)
+        session = sessions.get(session_id)
+        if session is None:
             return None
         
-        session = sessions[session_id]
-        
         # Check IP address
         if session['ip_address'] != ip_address:
             logger.warning(f"IP address mismatch for session {session_id}")
             return None
         
         # Check expiration
-        if datetime.utcnow() > session['expires_at']:
-            del sessions[session_id]
+        now = time.time()
+        if now > session['expires_at_ts']:
+            sessions.delete(session_id)
             return None
         
         # Update last activity
-        session['last_activity'] = datetime.utcnow()
+        session['last_activity_ts'] = now
+        sessions.touch(session_id, session)
         
         return {
             'username': username,
             'session_id': session_id,
-            'expires_at': session['expires_at']
+            'expires_at': datetime.utcfromtimestamp(session['expires_at_ts'])
         }
     
     except jwt.ExpiredSignatureError:
@@ -170,12 +410,11 @@ def authenticate_user(username: str, password: str, ip_address: str) -> Optional
     
     # For now, use default admin credentials
     # In production, this should check against a database
-    if username == DEFAULT_ADMIN_USER:
-        # Hash the default password for comparison
-        hashed_default = hash_password(DEFAULT_ADMIN_PASSWORD)
-        if verify_password(password, hashed_default):
-            record_login_attempt(username, ip_address, True)
-            return create_session(username, ip_address)
+    user_matches = hmac.compare_digest(username.encode('utf-8'), _ADMIN_USER_BYTES)
+    password_matches = _verify_cached(password, _ADMIN_HASH if user_matches else _DUMMY_HASH)
+    if user_matches and password_matches:
+        record_login_attempt(username, ip_address, True)
+        return create_session(username, ip_address)
     
     # Record failed attempt
     record_login_attempt(username, ip_address, False)
@@ -183,24 +422,9 @@ def authenticate_user(username: str, password: str, ip_address: str) -> Optional
 
 def logout_user(session_id: str):
     """Logout user and invalidate session."""
-    if session_id in sessions:
-        username = sessions[session_id]['username']
-        del sessions[session_id]
-        logger.info(f"User {username} logged out")
-
-def cleanup_expired_sessions():
-    """Clean up expired sessions."""
-    now = datetime.utcnow()
-    expired_sessions = [
-        session_id for session_id, session in sessions.items()
-        if now > session['expires_at']
-    ]
-    
-    for session_id in expired_sessions:
-        del sessions[session_id]
-    
-    if expired_sessions:
-        logger.info(f"Cleaned up {len(expired_sessions)} expired sessions")
+    session = sessions.delete(session_id)
+    if session is not None:
+        logger.info(f"User {session['username']} logged out")
 
 def require_auth(func):
     """Decorator to require authentication for functions."""
@@ -223,17 +447,15 @@ def require_admin(func):
 
 def get_security_status() -> Dict[str, Any]:
     """Get current security status and statistics."""
-    active_sessions = len([s for s in sessions.values() 
-                          if datetime.utcnow() < s['expires_at']])
-    
-    failed_attempts = sum(info['count'] for info in login_attempts.values())
+    # Both stores expire sessions themselves, so every stored session is active;
+    # the Redis store reports None rather than scanning the keyspace
+    active_sessions = sessions.count()
     
     return {
         'active_sessions': active_sessions,
-        'total_sessions': len(sessions),
-        'failed_login_attempts': failed_attempts,
-        'locked_accounts': len([k for k, v in login_attempts.items() 
-                               if v['count'] >= MAX_LOGIN_ATTEMPTS]),
+        'total_sessions': active_sessions,
+        'failed_login_attempts': _failed_attempts_total,
+        'locked_accounts': _locked_accounts_count,
         'session_timeout_minutes': SESSION_TIMEOUT,
         'max_login_attempts': MAX_LOGIN_ATTEMPTS,
         'lockout_duration_minutes': LOCKOUT_DURATION
@@ -4,28 +4,94 @@ This module provides functionality for creating and managing
 data catalog entries and metadata for the United Nations OSAA MVP project using Azure Blob Storage.
 """
 
+import os
+import tempfile
 from typing import Any
 
 import ibis
+import pyarrow.parquet as pq
 
 from pipeline.logging_config import create_logger, log_exception
-from pipeline.azure_utils import azure_blob_path_to_url
+from pipeline.azure_config import (
+    AZURE_STORAGE_CONTAINER_NAME,
+    PARQUET_COMPRESSION,
+    PARQUET_COMPRESSION_LEVEL,
+    PARQUET_COPY_OPTIONS,
+    PARQUET_ROW_GROUP_SIZE,
+    ensure_azure_ready,
+)
+from pipeline.azure_utils import azure_blob_path_to_url, duckdb_quote, upload_file_to_azure_blob
 
 # Set up logging
 logger = create_logger(__name__)
 
+# The compression level only applies to ZSTD
+_COMPRESSION_LEVEL = PARQUET_COMPRESSION_LEVEL if PARQUET_COMPRESSION == "zstd" else None
+
+
+# Columns narrowed before Parquet output. Indicator values stay DOUBLE: float32 keeps
+# only ~7 significant digits, which would round GDP and population figures
+NARROW_COLUMN_TYPES = {
+    "year": "int32",
+}
+
+
+def _narrow_columns(table_exp: ibis.Expr) -> ibis.Expr:
+    """Cast the columns listed in NARROW_COLUMN_TYPES that exist in the table."""
+    casts = {
+        name: table_exp[name].cast(dtype)
+        for name, dtype in NARROW_COLUMN_TYPES.items()
+        if name in table_exp.columns
+    }
+    return table_exp.mutate(**casts) if casts else table_exp
+
+
+def _write_parquet_batches(table_exp: ibis.Expr, sink: Any) -> None:
+    """Stream the table expression's record batches into a Parquet file.
+
+    Args:
+        table_exp: Ibis table expression to write.
+        sink: Local path or writable file object for the Parquet output.
+    """
+    reader = table_exp.to_pyarrow_batches(chunk_size=PARQUET_ROW_GROUP_SIZE)
+    with pq.ParquetWriter(
+        sink,
+        reader.schema,
+        compression=PARQUET_COMPRESSION,
+        compression_level=_COMPRESSION_LEVEL,
+        use_dictionary=True,
+        data_page_size=1 << 20,
+    ) as writer:
+        for batch in reader:
+            writer.write_batch(batch, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
 
 def save_azure_blob(table_exp: ibis.Expr, blob_path: str) -> None:
     """Save the Ibis table expression to Azure Blob Storage as a Parquet file.
 
+    Record batches are streamed into a local temporary Parquet file, so only one
+    row group is held in memory at a time, and the file is uploaded once it is
+    complete; a failed write never replaces the existing blob. DuckDB's azure
+    extension is read-only in the pinned release and cannot COPY TO az://.
+
     Args:
         table_exp: Ibis table expression to be saved.
         blob_path: The blob path where the Parquet file will be saved.
     """
     try:
+        ensure_azure_ready()
+
         # Convert blob path to full Azure URL
         azure_url = azure_blob_path_to_url(blob_path)
-        table_exp.to_parquet(azure_url)
+        table_exp = _narrow_columns(table_exp)
+
+        fd, local_path = tempfile.mkstemp(suffix=".parquet")
+        os.close(fd)
+        try:
+            _write_parquet_batches(table_exp, local_path)
+            upload_file_to_azure_blob(local_path, blob_path, AZURE_STORAGE_CONTAINER_NAME)
+        finally:
+            os.remove(local_path)
         logger.info(f"📤 Table successfully uploaded to Azure Blob Storage: {azure_url}")
         logger.info(f"   🔍 Table details: {table_exp}")
 
@@ -42,7 +108,13 @@ def save_duckdb(table_exp: ibis.Expr, local_db: Any) -> None:
         local_db: Connection to the local DuckDB database.
     """
     try:
-        local_db.create_table("master", table_exp.execute(), overwrite=True)
+        if ibis.get_backend(table_exp) is local_db:
+            # Same DuckDB connection: build the table inside DuckDB without materializing in Python
+            sql = ibis.to_sql(table_exp, dialect="duckdb")
+            local_db.raw_sql(f"CREATE OR REPLACE TABLE master AS {sql}")
+        else:
+            # Other backend: hand over Arrow data rather than a pandas DataFrame
+            local_db.create_table("master", table_exp.to_pyarrow(), overwrite=True)
         logger.info("🗄️ Table successfully created in persistent DuckDB")
         logger.info(f"   🔍 Table details: {table_exp}")
 
@@ -59,7 +131,21 @@ def save_parquet(table_exp: ibis.Expr, local_path: str) -> None:
         local_path: Local file path where the Parquet file will be saved.
     """
     try:
-        table_exp.to_parquet(local_path)
+        table_exp = _narrow_columns(table_exp)
+        backend = ibis.get_backend(table_exp)
+        if backend.name == "duckdb":
+            sql = ibis.to_sql(table_exp, dialect="duckdb")
+            backend.raw_sql(f"COPY ({sql}) TO {duckdb_quote(local_path)} ({PARQUET_COPY_OPTIONS})")
+        else:
+            pq.write_table(
+                table_exp.to_pyarrow(),
+                local_path,
+                compression=PARQUET_COMPRESSION,
+                compression_level=_COMPRESSION_LEVEL,
+                row_group_size=PARQUET_ROW_GROUP_SIZE,
+                use_dictionary=True,
+                data_page_size=1 << 20,
+            )
         logger.info(f"💾 Table successfully saved to local Parquet file: {local_path}")
         logger.info(f"   🔍 Table details: {table_exp}")
 
@@ -4,11 +4,16 @@ This module manages Azure-specific configuration settings and environment-specif
 parameters for the United Nations OSAA MVP project.
 """
 
+import functools
 import logging
 import os
-import sys
+import threading
 
 import colorlog
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from azure.core.pipeline.transport import RequestsTransport
 from azure.storage.blob import BlobServiceClient
 from azure.identity import DefaultAzureCredential, ClientSecretCredential
 from azure.core.exceptions import AzureError, ResourceNotFoundError
@@ -21,6 +26,7 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 # Define the LOCAL DATA directory relative to the root
 DATALAKE_DIR = os.path.join(ROOT_DIR, "data")
 RAW_DATA_DIR = os.getenv("RAW_DATA_DIR", os.path.join(DATALAKE_DIR, "raw"))
+CSV_SCHEMA_DIR = os.getenv("CSV_SCHEMA_DIR", os.path.join(DATALAKE_DIR, "schemas"))
 STAGING_DATA_DIR = os.path.join(DATALAKE_DIR, "staging")
 MASTER_DATA_DIR = os.path.join(STAGING_DATA_DIR, "master")
 
@@ -37,15 +43,73 @@ USERNAME = os.getenv("USERNAME", "default").lower()
 AZURE_ENV = TARGET if TARGET == "prod" else f"dev/{TARGET}_{USERNAME}"
 
 ENABLE_AZURE_UPLOAD = os.getenv("ENABLE_AZURE_UPLOAD", "true").lower() == "true"
+# Upload ingest Parquet from the conversion workers instead of keeping a local staging copy
+AZURE_DIRECT_WRITE = os.getenv("AZURE_DIRECT_WRITE", "false").lower() == "true"
 
 # Azure Blob Storage configurations
 AZURE_STORAGE_ACCOUNT_NAME = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
 AZURE_STORAGE_CONTAINER_NAME = os.getenv("AZURE_STORAGE_CONTAINER_NAME", "osaa-data-pipeline")
 AZURE_STORAGE_CONNECTION_STRING = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+# Connection string fields keyed by lower-cased name (e.g. "accountname", "accountkey")
+AZURE_STORAGE_CONNECTION_PARTS = {
+    key.strip().lower(): value.strip()
+    for key, _, value in (
+        part.partition("=") for part in (AZURE_STORAGE_CONNECTION_STRING or "").split(";") if "=" in part
+    )
+}
 AZURE_CLIENT_ID = os.getenv("AZURE_CLIENT_ID")
 AZURE_CLIENT_SECRET = os.getenv("AZURE_CLIENT_SECRET")
 AZURE_TENANT_ID = os.getenv("AZURE_TENANT_ID")
 
+# HTTP connection pool size shared by all blob operations. Concurrent files times
+# per-blob concurrency can exceed it; connections beyond the pool are discarded
+# after use, so size it for the busiest step
+AZURE_HTTP_POOL_SIZE = int(os.getenv("AZURE_HTTP_POOL_SIZE", str(max(16, (os.cpu_count() or 2) * 8))))
+# Seconds to wait for a connection and for each read; the read timeout
+# bounds a stalled transfer rather than the whole operation
+AZURE_CONNECTION_TIMEOUT = int(os.getenv("AZURE_CONNECTION_TIMEOUT", "60"))
+AZURE_READ_TIMEOUT = int(os.getenv("AZURE_READ_TIMEOUT", "300"))
+# Chunk size when streaming response bodies
+AZURE_CONNECTION_DATA_BLOCK_SIZE = int(os.getenv("AZURE_CONNECTION_DATA_BLOCK_SIZE", str(256 * 1024)))
+
+# Blob upload tuning: parallel block uploads per blob, the size up to which a blob
+# is sent in a single PUT, and the block size used above that
+AZURE_UPLOAD_MAX_CONCURRENCY = int(os.getenv("AZURE_UPLOAD_MAX_CONCURRENCY", "8"))
+AZURE_MAX_SINGLE_PUT_SIZE = int(os.getenv("AZURE_MAX_SINGLE_PUT_SIZE", str(4 * 1024 * 1024)))
+AZURE_MAX_BLOCK_SIZE = int(os.getenv("AZURE_MAX_BLOCK_SIZE", str(8 * 1024 * 1024)))
+# Parallel ranged GETs per blob download
+AZURE_DOWNLOAD_MAX_CONCURRENCY = int(os.getenv("AZURE_DOWNLOAD_MAX_CONCURRENCY", "8"))
+
+# Number of blob copies/deletes promotion keeps in flight (one pooled connection each)
+PROMOTE_CONCURRENCY = int(os.getenv("PROMOTE_CONCURRENCY", str(AZURE_HTTP_POOL_SIZE)))
+# Worker threads for the batch upload/download helpers; more than the
+# connection pool would just queue for connections
+AZURE_BATCH_WORKERS = int(os.getenv("AZURE_BATCH_WORKERS", str(AZURE_HTTP_POOL_SIZE)))
+
+# DuckDB resource limits for ingest; unset keeps DuckDB's defaults
+DUCKDB_THREADS = os.getenv("DUCKDB_THREADS")
+DUCKDB_MEMORY_LIMIT = os.getenv("DUCKDB_MEMORY_LIMIT")
+
+# Ingest conversion worker processes and DuckDB threads per worker
+# (DUCKDB_MEMORY_LIMIT applies to each worker's connection)
+CONVERT_WORKERS = int(os.getenv("CONVERT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+CONVERT_WORKER_THREADS = int(os.getenv("CONVERT_WORKER_THREADS", "2"))
+
+# Number of files the ingest step uploads concurrently
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "8"))
+# Skip CSVs whose content and conversion settings match what was last ingested
+INGEST_SKIP_UNCHANGED = os.getenv("INGEST_SKIP_UNCHANGED", "true").lower() == "true"
+
+# Parquet writer settings shared by the catalog and ingest steps
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd").lower()
+PARQUET_COMPRESSION_LEVEL = int(os.getenv("PARQUET_COMPRESSION_LEVEL", "3"))
+PARQUET_ROW_GROUP_SIZE = int(os.getenv("PARQUET_ROW_GROUP_SIZE", "1048576"))
+# Same settings as DuckDB COPY options; the compression level only applies to ZSTD
+PARQUET_COPY_OPTIONS = (
+    f"FORMAT PARQUET, COMPRESSION {PARQUET_COMPRESSION}, ROW_GROUP_SIZE {PARQUET_ROW_GROUP_SIZE}"
+    + (f", COMPRESSION_LEVEL {PARQUET_COMPRESSION_LEVEL}" if PARQUET_COMPRESSION == "zstd" else "")
+)
+
 LANDING_AREA_FOLDER = f"{AZURE_ENV}/landing"
 STAGING_AREA_FOLDER = f"{AZURE_ENV}/staging"
 
@@ -162,6 +226,163 @@ def validate_config():
     logger.info("Configuration validation successful")
 
 
+# Shared BlobServiceClient instances keyed by (auth mode, account identifier)
+_client_cache: dict[tuple, BlobServiceClient] = {}
+_client_cache_lock = threading.Lock()
+
+# Clients whose account access has already been confirmed with an account probe
+_verified_clients: set = set()
+
+# Token credentials keyed by auth mode; each instance keeps its own token cache,
+# so sharing one avoids acquiring a fresh token for every consumer
+_credential_cache: dict[str, object] = {}
+_credential_cache_lock = threading.Lock()
+
+# Log labels for each supported authentication mode
+_AUTH_MODE_LABELS = {
+    "connection_string": ("Azure Storage Connection String", "connection string", "Azure Connection String"),
+    "service_principal": ("Azure Service Principal Credentials", "service principal", "Azure Service Principal"),
+    "default": ("Default Azure Credentials", "default credentials", "Azure Default Credentials"),
+}
+
+
+def _get_auth_mode() -> str:
+    """
+    Determine which Azure authentication mode the configuration selects.
+
+    :return: One of "connection_string", "service_principal" or "default"
+    """
+    if AZURE_STORAGE_CONNECTION_STRING:
+        return "connection_string"
+    if AZURE_CLIENT_ID and AZURE_CLIENT_SECRET and AZURE_TENANT_ID:
+        return "service_principal"
+    return "default"
+
+
+def get_azure_credential(auth_mode: str = None):
+    """
+    Return the shared token credential for an auth mode, creating it on first use.
+
+    :param auth_mode: "service_principal" or "default" (uses the configured mode if None)
+    :return: ClientSecretCredential or DefaultAzureCredential, or None for connection strings
+    """
+    auth_mode = auth_mode or _get_auth_mode()
+    if auth_mode == "connection_string":
+        return None
+
+    with _credential_cache_lock:
+        credential = _credential_cache.get(auth_mode)
+        if credential is None:
+            if auth_mode == "service_principal":
+                credential = ClientSecretCredential(
+                    tenant_id=AZURE_TENANT_ID,
+                    client_id=AZURE_CLIENT_ID,
+                    client_secret=AZURE_CLIENT_SECRET
+                )
+            else:
+                credential = DefaultAzureCredential()
+            _credential_cache[auth_mode] = credential
+    return credential
+
+
+def _build_transport() -> RequestsTransport:
+    """
+    Build a keep-alive HTTP transport with an explicitly sized connection pool.
+
+    Reusing pooled connections avoids a fresh TCP and TLS handshake for every
+    blob request. Only connection failures are retried here; HTTP-level retries
+    are left to the Azure SDK retry policy.
+
+    :return: RequestsTransport backed by a pooled requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=AZURE_HTTP_POOL_SIZE,
+        pool_maxsize=AZURE_HTTP_POOL_SIZE,
+        max_retries=Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(
+        session=session,
+        connection_timeout=AZURE_CONNECTION_TIMEOUT,
+        read_timeout=AZURE_READ_TIMEOUT,
+        connection_data_block_size=AZURE_CONNECTION_DATA_BLOCK_SIZE,
+    )
+
+
+def _build_client(auth_mode: str) -> BlobServiceClient:
+    """
+    Construct a BlobServiceClient for the given auth mode and store it in the cache.
+
+    :param auth_mode: Authentication mode returned by _get_auth_mode()
+    :return: Newly created BlobServiceClient
+    :raises ConfigurationError: If the storage account name is missing
+    """
+    client_options = {
+        "transport": _build_transport(),
+        "max_single_put_size": AZURE_MAX_SINGLE_PUT_SIZE,
+        "max_block_size": AZURE_MAX_BLOCK_SIZE,
+    }
+
+    if auth_mode == "connection_string":
+        blob_service_client = BlobServiceClient.from_connection_string(
+            AZURE_STORAGE_CONNECTION_STRING,
+            **client_options
+        )
+    else:
+        if not AZURE_STORAGE_ACCOUNT_NAME:
+            raise ConfigurationError(
+                f"AZURE_STORAGE_ACCOUNT_NAME is required when using {_AUTH_MODE_LABELS[auth_mode][1]}"
+            )
+
+        blob_service_client = BlobServiceClient(
+            account_url=f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
+            credential=get_azure_credential(auth_mode),
+            **client_options
+        )
+
+    _client_cache[(auth_mode, AZURE_STORAGE_CONNECTION_STRING or AZURE_STORAGE_ACCOUNT_NAME)] = blob_service_client
+    return blob_service_client
+
+
+def get_blob_service_client() -> BlobServiceClient:
+    """
+    Return the shared BlobServiceClient, creating it on first use.
+
+    All Azure operations in the pipeline should go through this accessor so they
+    share one HTTP pipeline, policy chain and credential.
+
+    :return: Cached BlobServiceClient for the configured auth mode
+    :raises ConfigurationError: If the configuration is incomplete
+    """
+    auth_mode = _get_auth_mode()
+    cache_key = (auth_mode, AZURE_STORAGE_CONNECTION_STRING or AZURE_STORAGE_ACCOUNT_NAME)
+
+    with _client_cache_lock:
+        blob_service_client = _client_cache.get(cache_key)
+        if blob_service_client is None:
+            blob_service_client = _build_client(auth_mode)
+
+    return blob_service_client
+
+
+def verify_client_access(blob_service_client: BlobServiceClient) -> None:
+    """
+    Confirm account access with one get_account_information call per client.
+
+    Later calls for a client that has already been verified, by credential
+    validation or by a previous caller, return without a network round trip.
+
+    :param blob_service_client: Client to verify
+    :raises AzureError: If the account probe fails
+    """
+    if blob_service_client in _verified_clients:
+        return
+    blob_service_client.get_account_information()
+    _verified_clients.add(blob_service_client)
+
+
 def validate_azure_credentials():
     """
     Validate Azure credentials with structured error handling.
@@ -169,85 +390,28 @@ def validate_azure_credentials():
     Performs comprehensive checks:
     - Verifies presence of required environment variables
     - Validates Azure credential format
-    - Attempts BlobServiceClient creation
-    - Performs lightweight container listing test
+    - Attempts BlobServiceClient creation (cached for later reuse)
+    - Performs lightweight account information test
 
     :raises ConfigurationError: If credentials are invalid or missing
     """
-
-    def _mask_sensitive(value):
-        """Mask sensitive information in logs."""
-        return "*" * len(value) if value else "NOT SET"
-
     try:
         # Credential validation stages
         logger.info("Validating Azure Credentials")
 
-        # Check for connection string first (highest priority)
-        if AZURE_STORAGE_CONNECTION_STRING:
-            logger.info("Using Azure Storage Connection String")
-            try:
-                blob_service_client = BlobServiceClient.from_connection_string(
-                    AZURE_STORAGE_CONNECTION_STRING
-                )
-                # Test connection
-                blob_service_client.get_account_information()
-                logger.info("Azure credentials validated successfully with connection string")
-                return
-            except AzureError as e:
-                logger.error(f"Azure Connection String Error: {e}")
-                raise ConfigurationError(f"Azure Connection String Failed: {e}")
-
-        # Check for service principal credentials
-        if AZURE_CLIENT_ID and AZURE_CLIENT_SECRET and AZURE_TENANT_ID:
-            logger.info("Using Azure Service Principal Credentials")
-            try:
-                credential = ClientSecretCredential(
-                    tenant_id=AZURE_TENANT_ID,
-                    client_id=AZURE_CLIENT_ID,
-                    client_secret=AZURE_CLIENT_SECRET
-                )
-                if not AZURE_STORAGE_ACCOUNT_NAME:
-                    raise ConfigurationError("AZURE_STORAGE_ACCOUNT_NAME is required when using service principal")
-                
-                blob_service_client = BlobServiceClient(
-                    account_url=f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
-                    credential=credential
-                )
-                # Test connection
-                blob_service_client.get_account_information()
-                logger.info("Azure credentials validated successfully with service principal")
-                return
-            except AzureError as e:
-                logger.error(f"Azure Service Principal Error: {e}")
-                raise ConfigurationError(f"Azure Service Principal Failed: {e}")
-
-        # Check for default credentials (managed identity, CLI, etc.)
-        logger.info("Attempting to use Default Azure Credentials")
+        # Connection string takes priority, then service principal, then default credentials
+        auth_mode = _get_auth_mode()
+        mode_label, success_label, error_label = _AUTH_MODE_LABELS[auth_mode]
+        logger.info(f"Using {mode_label}")
+
         try:
-            credential = DefaultAzureCredential()
-            if not AZURE_STORAGE_ACCOUNT_NAME:
-                raise ConfigurationError("AZURE_STORAGE_ACCOUNT_NAME is required when using default credentials")
-            
-            blob_service_client = BlobServiceClient(
-                account_url=f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
-                credential=credential
-            )
-            # Test connection
-            blob_service_client.get_account_information()
-            logger.info("Azure credentials validated successfully with default credentials")
-            return
+            blob_service_client = get_blob_service_client()
+            # Test connection; later access checks on this client reuse the result
+            verify_client_access(blob_service_client)
+            logger.info(f"Azure credentials validated successfully with {success_label}")
         except AzureError as e:
-            logger.error(f"Azure Default Credentials Error: {e}")
-            raise ConfigurationError(f"Azure Default Credentials Failed: {e}")
-
-        # If we get here, no valid credential method was found
-        raise ConfigurationError(
-            "No valid Azure authentication method found. Please set one of:\n"
-            "- AZURE_STORAGE_CONNECTION_STRING\n"
-            "- AZURE_CLIENT_ID, AZURE_CLIENT_SECRET, AZURE_TENANT_ID, AZURE_STORAGE_ACCOUNT_NAME\n"
-            "- Default Azure Credentials with AZURE_STORAGE_ACCOUNT_NAME"
-        )
+            logger.error(f"{error_label} Error: {e}")
+            raise ConfigurationError(f"{error_label} Failed: {e}")
 
     except Exception as e:
         # Structured error reporting
@@ -272,10 +436,17 @@ def validate_azure_credentials():
         raise
 
 
-# Validate configuration and Azure credentials when module is imported
-try:
+@functools.lru_cache(maxsize=1)
+def ensure_azure_ready() -> None:
+    """
+    Validate configuration and Azure credentials once per process.
+
+    Called lazily before the first blob operation rather than at import time, so
+    importing this module never performs a network round trip. Failed validation
+    is not cached and will be retried on the next call.
+
+    :raises ConfigurationError: If configuration or credentials are invalid
+    """
     validate_config()
     if ENABLE_AZURE_UPLOAD:
         validate_azure_credentials()
-except ConfigurationError as config_error:
-    sys.exit(1)
@@ -4,16 +4,36 @@ This module handles the ingestion of CSV files, converting them to Parquet,
 and optionally uploading them to Azure Blob Storage for the United Nations OSAA MVP project.
 """
 
+import asyncio
+import csv
+import hashlib
+import json
+import multiprocessing
 import os
-import re
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
 
 import duckdb
-from typing import Dict, Optional
+import pyarrow.parquet as pq
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from pipeline.azure_config import (
+    ensure_azure_ready,
+    AZURE_DIRECT_WRITE,
+    CONVERT_WORKERS,
+    CONVERT_WORKER_THREADS,
+    CSV_SCHEMA_DIR,
+    DUCKDB_MEMORY_LIMIT,
+    DUCKDB_THREADS,
+    AZURE_UPLOAD_MAX_CONCURRENCY,
     ENABLE_AZURE_UPLOAD,
+    INGEST_CONCURRENCY,
+    INGEST_SKIP_UNCHANGED,
     LANDING_AREA_FOLDER,
+    PARQUET_COMPRESSION,
+    PARQUET_COMPRESSION_LEVEL,
+    PARQUET_ROW_GROUP_SIZE,
     RAW_DATA_DIR,
     AZURE_STORAGE_CONTAINER_NAME,
     TARGET,
@@ -24,13 +44,189 @@ from pipeline.exceptions import (
     IngestError,
     AzureOperationError,
 )
-from pipeline.logging_config import create_logger, log_exception
-from pipeline.azure_utils import azure_blob_init, upload_file_to_azure_blob, azure_blob_path_to_url
+from pipeline.logging_config import create_logger
+from pipeline.azure_utils import (
+    azure_blob_init,
+    upload_file_to_azure_blob,
+)
 
 # Initialize logger
 logger = create_logger(__name__)
 
 
+# The CSV path, column types and dialect are bound as parameters
+_READ_CSV_SQL = """
+    SELECT * FROM read_csv(
+        $csv_path,
+        columns = $columns,
+        auto_detect = false,
+        delim = $delim,
+        quote = $quote,
+        escape = $escape,
+        skip = $skip,
+        header = $header
+    )
+"""
+
+# Sniffs the dialect and column types the way read_csv_auto would
+_SNIFF_CSV_SQL = "SELECT Delimiter, Quote, Escape, SkipRows, HasHeader, Columns FROM sniff_csv(?)"
+
+# Dialect assumed for schemas registered before the dialect was recorded
+_DEFAULT_CSV_DIALECT = {'delim': ',', 'quote': '"', 'escape': '"', 'skip': 0, 'header': True}
+
+# Converted files mirror the raw tree in a sibling staging directory
+_STAGING_DIR = str(Path(RAW_DATA_DIR).with_name('staging'))
+
+# The compression level only applies to ZSTD
+_COMPRESSION_LEVEL = PARQUET_COMPRESSION_LEVEL if PARQUET_COMPRESSION == "zstd" else None
+
+# DuckDB connection owned by each conversion worker process
+_worker_con = None
+
+# Output directories this process has already created
+_created_dirs: Set[str] = set()
+
+# Source fingerprints are kept as metadata on the landing blobs, or in this
+# file next to the staged output when uploads are disabled
+_FINGERPRINT_METADATA_KEY = 'src_hash'
+_FINGERPRINTS_PATH = os.path.join(_STAGING_DIR, '.source_fingerprints.json')
+
+
+def _connect_duckdb(threads: Optional[int] = None) -> duckdb.DuckDBPyConnection:
+    """Open a DuckDB connection with the ingest settings applied."""
+    con = duckdb.connect()
+    if threads:
+        con.execute("SET threads = ?", [threads])
+    if DUCKDB_MEMORY_LIMIT:
+        con.execute("SET memory_limit = ?", [DUCKDB_MEMORY_LIMIT])
+    # Row order within a file does not matter downstream; letting DuckDB
+    # drop it lets CSV scans run in parallel with less buffering
+    con.execute("SET preserve_insertion_order = false")
+    return con
+
+
+def _read_csv_header(csv_file_path: str, dialect: Dict[str, Any]) -> List[str]:
+    """
+    Read the first row of a CSV file, which holds the column names when it has a header.
+
+    :param csv_file_path: Path to the CSV file
+    :param dialect: read_csv dialect options the file was sniffed with
+    :return: Fields of the first row in file order (empty for an empty file)
+    """
+    with open(csv_file_path, newline='', encoding='utf-8-sig', errors='replace') as f:
+        for _ in range(dialect['skip']):
+            f.readline()
+        reader = csv.reader(
+            f,
+            delimiter=dialect['delim'],
+            quotechar=dialect['quote'] or None,
+            escapechar=dialect['escape'] if dialect['escape'] not in ('', dialect['quote']) else None,
+        )
+        return next(reader, [])
+
+
+def _source_fingerprint(csv_file_path: str, schema: Dict[str, Any]) -> str:
+    """
+    Hash a CSV's content together with the settings its Parquet output depends on.
+
+    :param csv_file_path: Path to the CSV file
+    :param schema: Column types and dialect the CSV is read with
+    :return: Hex digest identifying this input and conversion
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(
+        [schema, PARQUET_COMPRESSION, _COMPRESSION_LEVEL, PARQUET_ROW_GROUP_SIZE]
+    ).encode())
+    with open(csv_file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_parquet(reader, sink) -> None:
+    """Write an Arrow record batch reader to a Parquet path or file object, one row group per batch."""
+    with pq.ParquetWriter(
+        sink,
+        reader.schema,
+        compression=PARQUET_COMPRESSION,
+        compression_level=_COMPRESSION_LEVEL,
+        use_dictionary=True,
+    ) as writer:
+        for batch in reader:
+            writer.write_batch(batch, row_group_size=PARQUET_ROW_GROUP_SIZE)
+
+
+def _convert_csv(con: duckdb.DuckDBPyConnection, csv_file_path: str, output_path: str,
+                 schema: Dict[str, Any]) -> str:
+    """
+    Convert a CSV file with known column types and dialect to Parquet on the given connection.
+
+    :param con: DuckDB connection to read the CSV with
+    :param csv_file_path: Path to the input CSV file
+    :param output_path: Local path or az:// URL for the output Parquet file
+    :param schema: Column types and dialect, as returned by AzureIngest.get_csv_schema
+    :return: Path to the converted Parquet file
+    :raises FileConversionError: If conversion fails
+    """
+    try:
+        logger.info(f"Converting CSV to Parquet: {csv_file_path}")
+
+        # Use DuckDB to read the CSV; declaring the columns and dialect skips the sniffer
+        reader = con.execute(
+            _READ_CSV_SQL,
+            {'csv_path': csv_file_path, 'columns': schema['columns'], **schema['dialect']},
+        ).fetch_record_batch(PARQUET_ROW_GROUP_SIZE)
+
+        if output_path.startswith('az://'):
+            # Write to a temporary file and upload only a complete one: an fsspec/adlfs
+            # handle commits whatever was written when an error unwinds its context,
+            # replacing the last good blob with a truncated file
+            container_name, _, blob_path = output_path[len('az://'):].partition('/')
+            fd, local_path = tempfile.mkstemp(suffix='.parquet')
+            os.close(fd)
+            try:
+                _write_parquet(reader, local_path)
+                upload_file_to_azure_blob(local_path, blob_path, container_name)
+            finally:
+                os.remove(local_path)
+        else:
+            # Ensure output directory exists; most files share a few directories
+            output_dir = os.path.dirname(output_path)
+            if output_dir not in _created_dirs:
+                os.makedirs(output_dir, exist_ok=True)
+                _created_dirs.add(output_dir)
+            _write_parquet(reader, output_path)
+        logger.info(f"✅ Successfully converted to Parquet: {output_path}")
+
+        return output_path
+
+    except Exception as e:
+        error_msg = f"CSV to Parquet conversion failed for {csv_file_path}: {str(e)}"
+        logger.error(error_msg)
+        raise FileConversionError(error_msg)
+
+
+def _init_convert_worker() -> None:
+    """Open the DuckDB connection a conversion worker process uses for all its files."""
+    global _worker_con
+    _worker_con = _connect_duckdb(CONVERT_WORKER_THREADS)
+
+
+def _convert_in_worker(csv_file_path: str, output_path: str, schema: Dict[str, Any]) -> str:
+    """Convert one CSV in a conversion worker process."""
+    return _convert_csv(_worker_con, csv_file_path, output_path, schema)
+
+
+def _iter_csv_files(root: str) -> Iterator[str]:
+    """Yield paths of all CSV files under root, using scandir's cached entry types."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_csv_files(entry.path)
+            elif entry.is_file() and entry.name.lower().endswith('.csv'):
+                yield entry.path
+
+
 class AzureIngest:
     """Manage the data ingestion process for the United Nations OSAA MVP project using Azure Blob Storage.
 
@@ -53,113 +249,123 @@ class AzureIngest:
         based on the configuration settings.
         """
         logger.info("Initializing Azure Ingest Process")
+        ensure_azure_ready()
 
-        # Initialize DuckDB with required extensions
-        self.con = duckdb.connect()
+        # Initialize DuckDB with required extensions; the settings apply to the whole run
+        self.con = _connect_duckdb(int(DUCKDB_THREADS) if DUCKDB_THREADS else None)
         self.con.install_extension('httpfs')
         self.con.load_extension('httpfs')
+
+        # Column types and dialects per source, loaded from CSV_SCHEMA_DIR on first use
+        self._csv_schemas: Dict[str, Dict[str, Dict[str, Any]]] = {}
         
         if ENABLE_AZURE_UPLOAD:
             logger.info("Initializing Azure Blob Service Client...")
             self.azure_client = azure_blob_init()
+            # Shared by all uploads so they reuse the client's pooled connections
+            self.container_client = self.azure_client.get_container_client(AZURE_STORAGE_CONTAINER_NAME)
             logger.info("Azure Blob Service Client Initialized")
         else:
             logger.warning("Azure upload is disabled")
             self.azure_client = None
+            self.container_client = None
 
-    def setup_azure_secret(self):
+    def get_csv_schema(self, csv_file_path: str, refresh: bool = False) -> Dict[str, Any]:
         """
-        Set up the Azure Blob Storage secret in DuckDB for Azure access.
-
-        :raises AzureOperationError: If there are issues setting up Azure secret
+        Return the column types and dialect for a raw CSV file.
+
+        Schemas live in CSV_SCHEMA_DIR as one JSON file per source (the first directory
+        under RAW_DATA_DIR), mapping each file's path within the source to its columns
+        and the read_csv dialect options (delim, quote, escape, skip, header) sniffed
+        with them. Files without a registered schema are sniffed once and the result is
+        saved; a schema whose columns no longer match the file's first row is re-inferred.
+        Entries holding only column types predate the recorded dialect and are read with
+        the comma-separated default.
+
+        :param csv_file_path: Path to the CSV file
+        :param refresh: Re-infer the schema even if a matching one is registered
+        :return: Dict with the ordered 'columns' mapping of name to DuckDB type and the 'dialect' options
         """
-        if not ENABLE_AZURE_UPLOAD:
-            logger.info("Azure upload disabled, skipping Azure secret setup")
-            return
-
-        try:
-            logger.info("🔐 Setting up Azure Blob Storage Secret in DuckDB")
-            logger.info("   Creating Azure secret with connection string or credentials")
-
-            # For Azure, we'll use a different approach than AWS
-            # We can either use connection string or account key
-            from pipeline.azure_config import AZURE_STORAGE_CONNECTION_STRING
-            
-            if AZURE_STORAGE_CONNECTION_STRING:
-                # Extract account name and key from connection string
-                import re
-                account_match = re.search(r'AccountName=([^;]+)', AZURE_STORAGE_CONNECTION_STRING)
-                key_match = re.search(r'AccountKey=([^;]+)', AZURE_STORAGE_CONNECTION_STRING)
-                
-                if account_match and key_match:
-                    account_name = account_match.group(1)
-                    account_key = key_match.group(1)
-                    
-                    # Drop existing secret if it exists
-                    self.con.sql("DROP SECRET IF EXISTS my_azure_secret")
-                    logger.info("   Dropped existing Azure secret")
-
-                    # Create the SQL statement for Azure
-                    sql_statement = f"""
-                        CREATE PERSISTENT SECRET my_azure_secret (
-                            TYPE AZURE,
-                            ACCOUNT_NAME '{account_name}',
-                            ACCOUNT_KEY '{account_key}'
-                        )
-                    """
-                    
-                    self.con.sql(sql_statement)
-                    logger.info("   ✅ Azure secret created successfully in DuckDB")
-                else:
-                    logger.warning("   Could not extract account name/key from connection string")
-                    logger.warning("   Azure Blob Storage access may be limited")
+        relative_path = os.path.relpath(csv_file_path, RAW_DATA_DIR)
+        source, _, file_key = relative_path.replace(os.sep, '/').partition('/')
+        if not file_key:
+            source, file_key = 'root', source
+
+        schema_path = os.path.join(CSV_SCHEMA_DIR, f"{source}.json")
+        schemas = self._csv_schemas.get(source)
+        if schemas is None:
+            schemas = {}
+            if os.path.exists(schema_path):
+                with open(schema_path) as schema_file:
+                    schemas = json.load(schema_file)
+            self._csv_schemas[source] = schemas
+
+        schema = schemas.get(file_key)
+        if schema is not None and not isinstance(schema.get('columns'), dict):
+            schema = {'columns': schema, 'dialect': dict(_DEFAULT_CSV_DIALECT)}
+
+        if schema is None:
+            logger.info(f"No schema registered for {relative_path}, inferring it")
+        elif refresh:
+            schema = None
+        else:
+            first_row = _read_csv_header(csv_file_path, schema['dialect'])
+            if schema['dialect']['header']:
+                matches = list(schema['columns']) == first_row
             else:
-                logger.warning("   No Azure Storage connection string found")
-                logger.warning("   Azure Blob Storage access may be limited")
-
-        except Exception as e:
-            error_msg = f"Failed to setup Azure secret in DuckDB: {str(e)}"
-            logger.error(error_msg)
-            raise AzureOperationError(error_msg)
+                matches = len(schema['columns']) == len(first_row)
+            if not matches:
+                logger.warning(f"⚠️ Columns of {relative_path} no longer match its registered schema, re-inferring it")
+                schema = None
+
+        if schema is None:
+            delim, quote, escape, skip, header, columns = self.con.execute(
+                _SNIFF_CSV_SQL, [csv_file_path]
+            ).fetchone()
+            schema = schemas[file_key] = {
+                'columns': {column['name']: column['type'] for column in columns},
+                'dialect': {'delim': delim, 'quote': quote, 'escape': escape, 'skip': skip, 'header': header},
+            }
+
+            os.makedirs(CSV_SCHEMA_DIR, exist_ok=True)
+            with open(schema_path, 'w') as schema_file:
+                json.dump(schemas, schema_file, indent=2)
+            logger.info(f"Saved inferred schema to {schema_path}")
+
+        return schema
 
     def convert_csv_to_parquet(self, csv_file_path: str, output_path: str) -> str:
         """
         Convert a CSV file to Parquet format using DuckDB.
 
+        Rows are streamed from DuckDB as Arrow record batches of PARQUET_ROW_GROUP_SIZE
+        rows and written one row group at a time, so memory stays bounded by a single
+        batch regardless of file size. For an az://container/blob output path the file
+        is written to a temporary location and uploaded once complete, so a failed
+        conversion never replaces the existing blob. If the registered schema fails to
+        read the file, it is re-inferred once and the conversion retried.
+
         :param csv_file_path: Path to the input CSV file
-        :param output_path: Path for the output Parquet file
+        :param output_path: Local path or az:// URL for the output Parquet file
         :return: Path to the converted Parquet file
         :raises FileConversionError: If conversion fails
         """
         try:
-            logger.info(f"Converting CSV to Parquet: {csv_file_path}")
-
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-            # Use DuckDB to convert CSV to Parquet
-            query = f"""
-                COPY (
-                    SELECT * FROM read_csv_auto('{csv_file_path}')
-                ) TO '{output_path}' (FORMAT PARQUET)
-            """
-
-            self.con.sql(query)
-            logger.info(f"✅ Successfully converted to Parquet: {output_path}")
-
-            return output_path
-
-        except Exception as e:
-            error_msg = f"CSV to Parquet conversion failed for {csv_file_path}: {str(e)}"
-            logger.error(error_msg)
-            raise FileConversionError(error_msg)
-
-    def upload_to_azure_blob(self, local_file_path: str, blob_path: str) -> None:
+            return _convert_csv(self.con, csv_file_path, output_path, self.get_csv_schema(csv_file_path))
+        except FileConversionError:
+            logger.warning(f"⚠️ Registered schema failed for {csv_file_path}, re-inferring it and retrying")
+            return _convert_csv(
+                self.con, csv_file_path, output_path, self.get_csv_schema(csv_file_path, refresh=True)
+            )
+
+    def upload_to_azure_blob(self, local_file_path: str, blob_path: str,
+                             metadata: Optional[Dict[str, str]] = None) -> None:
         """
         Upload a local file to Azure Blob Storage.
 
         :param local_file_path: Local file path to upload
         :param blob_path: Blob path in Azure Blob Storage
+        :param metadata: Optional metadata to set on the blob
         :raises AzureOperationError: If upload fails
         """
         if not ENABLE_AZURE_UPLOAD:
@@ -168,7 +374,14 @@ class AzureIngest:
 
         try:
             logger.info(f"Uploading to Azure Blob Storage: {blob_path}")
-            upload_file_to_azure_blob(local_file_path, blob_path, AZURE_STORAGE_CONTAINER_NAME)
+            with open(local_file_path, 'rb') as data:
+                self.container_client.get_blob_client(blob_path).upload_blob(
+                    data,
+                    length=os.fstat(data.fileno()).st_size,
+                    overwrite=True,
+                    metadata=metadata,
+                    max_concurrency=AZURE_UPLOAD_MAX_CONCURRENCY,
+                )
             logger.info(f"✅ Successfully uploaded to Azure Blob Storage: {blob_path}")
 
         except Exception as e:
@@ -176,6 +389,190 @@ class AzureIngest:
             logger.error(error_msg)
             raise AzureOperationError(error_msg)
 
+    def load_fingerprints(self) -> Dict[str, str]:
+        """
+        Load the source fingerprints recorded by previous runs.
+
+        With Azure upload enabled they are read from the landing blobs' metadata in a
+        single listing; otherwise from the local fingerprints file, keeping only entries
+        whose staged Parquet file still exists.
+
+        :return: Mapping of landing blob path to source fingerprint
+        """
+        if ENABLE_AZURE_UPLOAD:
+            return {
+                blob.name: blob.metadata[_FINGERPRINT_METADATA_KEY]
+                for blob in self.container_client.list_blobs(
+                    name_starts_with=f"{LANDING_AREA_FOLDER}/", include=['metadata']
+                )
+                if blob.metadata and _FINGERPRINT_METADATA_KEY in blob.metadata
+            }
+
+        try:
+            with open(_FINGERPRINTS_PATH) as f:
+                fingerprints = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        landing_prefix = f"{LANDING_AREA_FOLDER}/"
+        return {
+            blob_path: fingerprint
+            for blob_path, fingerprint in fingerprints.items()
+            if blob_path.startswith(landing_prefix) and os.path.exists(
+                os.path.join(_STAGING_DIR, blob_path[len(landing_prefix):])
+            )
+        }
+
+    def save_fingerprints(self, fingerprints: Dict[str, str]) -> None:
+        """
+        Record source fingerprints locally; with Azure upload enabled they live on the blobs instead.
+
+        Without INGEST_SKIP_UNCHANGED no fingerprints are computed, so a stale local record
+        is removed rather than left to match files it no longer describes.
+
+        :param fingerprints: Mapping of landing blob path to source fingerprint
+        """
+        if ENABLE_AZURE_UPLOAD:
+            return
+        if not INGEST_SKIP_UNCHANGED:
+            if os.path.exists(_FINGERPRINTS_PATH):
+                os.remove(_FINGERPRINTS_PATH)
+            return
+        os.makedirs(_STAGING_DIR, exist_ok=True)
+        with open(_FINGERPRINTS_PATH, 'w') as f:
+            json.dump(fingerprints, f, indent=2, sort_keys=True)
+
+    def build_jobs(self) -> List[Tuple[str, str, str, str]]:
+        """
+        Collect all CSV files up front so conversion and upload can be pipelined.
+
+        Files whose output would collide with an earlier file's (e.g. a.csv and a.CSV)
+        are logged and skipped rather than silently overwriting each other.
+
+        :return: (csv_path, relative_path, parquet_path, blob_path) tuples
+        """
+        jobs = []
+        seen_outputs: Dict[str, str] = {}
+        for csv_path in _iter_csv_files(RAW_DATA_DIR):
+            relative_path = os.path.relpath(csv_path, RAW_DATA_DIR)
+            relative_parquet = os.path.splitext(relative_path)[0] + '.parquet'
+
+            if relative_parquet in seen_outputs:
+                logger.warning(
+                    f"⚠️ Skipping {relative_path}: output {relative_parquet} already produced by "
+                    f"{seen_outputs[relative_parquet]}"
+                )
+                continue
+            seen_outputs[relative_parquet] = relative_path
+
+            parquet_path = os.path.join(_STAGING_DIR, relative_parquet)
+            blob_path = f"{LANDING_AREA_FOLDER}/{relative_parquet.replace(os.sep, '/')}"
+            jobs.append((csv_path, relative_path, parquet_path, blob_path))
+
+        logger.info(f"Found {len(jobs)} CSV files to process")
+        return jobs
+
+    async def _process_files(self, jobs: List[Tuple[str, str, str, str]]) -> int:
+        """
+        Convert and upload files concurrently.
+
+        Schemas are resolved first on this process's connection. Conversions then run
+        in CONVERT_WORKERS processes, each with its own DuckDB connection, while up to
+        INGEST_CONCURRENCY uploads of finished files run alongside them on the shared
+        blob client. A conversion that fails with the registered schema is retried once
+        with a freshly inferred one.
+
+        :param jobs: (csv_path, relative_path, parquet_path, blob_path) tuples
+        :return: Number of files processed successfully
+        """
+        # Workers only read and write; sniffing and saving schemas stays here
+        schemas_by_csv = {}
+        for csv_path, relative_path, _, _ in jobs:
+            try:
+                schemas_by_csv[csv_path] = self.get_csv_schema(csv_path)
+            except Exception as e:
+                logger.error(f"❌ Failed to process {relative_path}: {str(e)}")
+        jobs = [job for job in jobs if job[0] in schemas_by_csv]
+        if not jobs:
+            return 0
+
+        loop = asyncio.get_running_loop()
+        upload_slots = asyncio.Semaphore(INGEST_CONCURRENCY)
+        fingerprints = self.load_fingerprints() if INGEST_SKIP_UNCHANGED else {}
+
+        # Spawned rather than forked, so workers do not inherit this process's
+        # DuckDB threads or open connections
+        with ProcessPoolExecutor(
+            max_workers=min(CONVERT_WORKERS, len(jobs)),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_convert_worker,
+        ) as convert_pool, \
+                ThreadPoolExecutor(max_workers=INGEST_CONCURRENCY, thread_name_prefix='ingest-upload') as upload_pool:
+
+            async def process_one(csv_path: str, relative_path: str, parquet_path: str, blob_path: str) -> bool:
+                try:
+                    schema = schemas_by_csv[csv_path]
+                    # Hashing reads the whole CSV, so it only happens when the result is used
+                    metadata = None
+                    if INGEST_SKIP_UNCHANGED:
+                        fingerprint = await loop.run_in_executor(
+                            upload_pool, _source_fingerprint, csv_path, schema
+                        )
+                        if fingerprints.get(blob_path) == fingerprint:
+                            logger.info(f"⏭️ Unchanged since last ingest, skipping: {relative_path}")
+                            return True
+                        metadata = {_FINGERPRINT_METADATA_KEY: fingerprint}
+
+                    direct_write = ENABLE_AZURE_UPLOAD and AZURE_DIRECT_WRITE
+                    # Direct writes convert and upload inside the worker, skipping the staging tree
+                    output_path = f"az://{AZURE_STORAGE_CONTAINER_NAME}/{blob_path}" if direct_write else parquet_path
+
+                    # Convert CSV to Parquet
+                    try:
+                        converted_path = await loop.run_in_executor(
+                            convert_pool, _convert_in_worker, csv_path, output_path, schema
+                        )
+                    except FileConversionError:
+                        # The file may have changed in a way its column names do not show,
+                        # such as a new delimiter or a value outside a column's type
+                        logger.warning(f"⚠️ Registered schema failed for {relative_path}, re-inferring it and retrying")
+                        schema = schemas_by_csv[csv_path] = self.get_csv_schema(csv_path, refresh=True)
+                        converted_path = await loop.run_in_executor(
+                            convert_pool, _convert_in_worker, csv_path, output_path, schema
+                        )
+                        if metadata:
+                            metadata = {_FINGERPRINT_METADATA_KEY: await loop.run_in_executor(
+                                upload_pool, _source_fingerprint, csv_path, schema
+                            )}
+
+                    if direct_write:
+                        if metadata:
+                            await loop.run_in_executor(
+                                upload_pool,
+                                self.container_client.get_blob_client(blob_path).set_blob_metadata,
+                                metadata,
+                            )
+                    elif ENABLE_AZURE_UPLOAD:
+                        # Upload to Azure Blob Storage
+                        async with upload_slots:
+                            await loop.run_in_executor(
+                                upload_pool, self.upload_to_azure_blob, converted_path, blob_path, metadata
+                            )
+                    
+                    if metadata:
+                        fingerprints[blob_path] = metadata[_FINGERPRINT_METADATA_KEY]
+                    logger.info(f"✅ Processed: {relative_path}")
+                    return True
+                    
+                except Exception as e:
+                    logger.error(f"❌ Failed to process {relative_path}: {str(e)}")
+                    return False
+
+            results = await asyncio.gather(*(process_one(*job) for job in jobs))
+
+        self.save_fingerprints(fingerprints)
+
+        return sum(results)
+
     def process_data_sources(self) -> None:
         """
         Process all data sources in the raw data directory.
@@ -183,7 +580,8 @@ class AzureIngest:
         This method:
         1. Scans the raw data directory for CSV files
         2. Converts each CSV to Parquet format
-        3. Optionally uploads to Azure Blob Storage
+        3. Optionally uploads to Azure Blob Storage, overlapping uploads with
+           the conversion of the next files
         """
         try:
             logger.info("Starting data source processing")
@@ -194,40 +592,8 @@ class AzureIngest:
                 logger.warning(f"Raw data directory does not exist: {RAW_DATA_DIR}")
                 return
 
-            # Setup Azure secret for DuckDB if needed
-            self.setup_azure_secret()
-
-            processed_count = 0
-            
-            # Walk through all subdirectories in raw data
-            for root, dirs, files in os.walk(RAW_DATA_DIR):
-                for file in files:
-                    if file.lower().endswith('.csv'):
-                        csv_path = os.path.join(root, file)
-                        relative_path = os.path.relpath(csv_path, RAW_DATA_DIR)
-                        
-                        # Create output path (replace .csv with .parquet)
-                        parquet_filename = os.path.splitext(file)[0] + '.parquet'
-                        parquet_path = os.path.join(RAW_DATA_DIR.replace('raw', 'staging'), 
-                                                  os.path.dirname(relative_path), 
-                                                  parquet_filename)
-                        
-                        try:
-                            # Convert CSV to Parquet
-                            converted_path = self.convert_csv_to_parquet(csv_path, parquet_path)
-                            
-                            # Upload to Azure Blob Storage if enabled
-                            if ENABLE_AZURE_UPLOAD:
-                                # Create blob path
-                                blob_path = f"{LANDING_AREA_FOLDER}/{relative_path.replace('.csv', '.parquet')}"
-                                self.upload_to_azure_blob(converted_path, blob_path)
-                            
-                            processed_count += 1
-                            logger.info(f"✅ Processed: {relative_path}")
-                            
-                        except Exception as e:
-                            logger.error(f"❌ Failed to process {relative_path}: {str(e)}")
-                            continue
+            jobs = self.build_jobs()
+            processed_count = asyncio.run(self._process_files(jobs))
 
             logger.info(f"🎉 Data processing completed. Processed {processed_count} files.")
 
@@ -4,20 +4,34 @@ This module provides functionality to promote data from development to productio
 environments within Azure Blob Storage.
 """
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from pipeline.exceptions import AzureOperationError
 from pipeline.logging_config import create_logger
-from pipeline.azure_config import AZURE_STORAGE_CONTAINER_NAME
-from pipeline.azure_utils import (
-    azure_blob_init,
-    list_azure_blobs,
-    copy_azure_blob,
-    delete_azure_blob,
-    blob_exists
-)
+from pipeline.azure_config import AZURE_STORAGE_CONTAINER_NAME, PROMOTE_CONCURRENCY
+from pipeline.azure_utils import azure_blob_init, delete_azure_blobs_batch
 
 logger = create_logger(__name__)
 
-def promote_environment(
+def _is_current(source_blob, target_blob) -> bool:
+    """
+    Check whether a target blob already holds the source blob's content.
+
+    ETags are per-blob, so content is compared by size plus Content-MD5 (which a
+    server-side copy carries over); blobs without an MD5 fall back to the target
+    being at least as new as the source.
+    """
+    if target_blob is None or target_blob.size != source_blob.size:
+        return False
+
+    source_md5 = source_blob.content_settings.content_md5
+    target_md5 = target_blob.content_settings.content_md5
+    if source_md5 or target_md5:
+        return source_md5 == target_md5
+    return target_blob.last_modified >= source_blob.last_modified
+
+async def promote_environment_async(
     source_env: str = "dev",
     target_env: str = "prod",
     folder: str = "landing",
@@ -25,6 +39,10 @@ def promote_environment(
     """
     Promote contents from source to target environment using Azure Blob Storage.
 
+    Server-side copies of new or changed blobs are issued concurrently, up to
+    PROMOTE_CONCURRENCY at a time, on the shared client, alongside batched deletes
+    of stale ones. Blobs whose target is already current are skipped.
+
     Args:
         source_env: Source environment (default: "dev")
         target_env: Target environment (default: "prod")
@@ -41,33 +59,60 @@ def promote_environment(
         
         # Initialize Azure Blob Service Client
         blob_service_client = azure_blob_init()
-        
-        # Get list of all blobs in source
-        source_blobs = set()
-        source_blob_list = list_azure_blobs(prefix=source_prefix, container_name=AZURE_STORAGE_CONTAINER_NAME)
-        
-        for blob_name in source_blob_list:
-            source_blobs.add(blob_name)
-            target_blob_name = blob_name.replace(source_prefix, target_prefix, 1)
-            
-            # Copy blob to new location
-            logger.info(f"Copying {blob_name} to {target_blob_name}")
-            copy_azure_blob(
-                source_blob_name=blob_name,
-                dest_blob_name=target_blob_name,
-                source_container=AZURE_STORAGE_CONTAINER_NAME,
-                dest_container=AZURE_STORAGE_CONTAINER_NAME
+        container_client = blob_service_client.get_container_client(AZURE_STORAGE_CONTAINER_NAME)
+
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(PROMOTE_CONCURRENCY)
+
+        def list_blobs(prefix: str) -> dict:
+            return {blob.name: blob for blob in container_client.list_blobs(name_starts_with=prefix)}
+
+        def copy_blob(blob_name: str, target_blob_name: str) -> None:
+            source_url = container_client.get_blob_client(blob_name).url
+            container_client.get_blob_client(target_blob_name).start_copy_from_url(source_url)
+
+        with ThreadPoolExecutor(max_workers=PROMOTE_CONCURRENCY, thread_name_prefix='promote') as pool:
+
+            async def run(func, *args) -> None:
+                async with slots:
+                    await loop.run_in_executor(pool, func, *args)
+
+            # Get list of all blobs in source and target
+            source_blobs, target_blobs = await asyncio.gather(
+                loop.run_in_executor(pool, list_blobs, source_prefix),
+                loop.run_in_executor(pool, list_blobs, target_prefix),
             )
+            # Listing by prefix guarantees every source name starts with source_prefix
+            source_prefix_len = len(source_prefix)
+            target_names = {
+                blob_name: target_prefix + blob_name[source_prefix_len:]
+                for blob_name in source_blobs
+            }
 
-        # Get list of all blobs in target and delete those not in source
-        target_blob_list = list_azure_blobs(prefix=target_prefix, container_name=AZURE_STORAGE_CONTAINER_NAME)
-        
-        for blob_name in target_blob_list:
-            corresponding_source_blob = blob_name.replace(target_prefix, source_prefix, 1)
-            
-            if corresponding_source_blob not in source_blobs:
+            operations = []
+            skipped_count = 0
+            for blob_name, target_blob_name in target_names.items():
+                if _is_current(source_blobs[blob_name], target_blobs.get(target_blob_name)):
+                    skipped_count += 1
+                    continue
+
+                # Copy blob to new location
+                logger.info(f"Copying {blob_name} to {target_blob_name}")
+                operations.append(run(copy_blob, blob_name, target_blob_name))
+
+            if skipped_count:
+                logger.info(f"Skipped {skipped_count} blobs already current in target")
+
+            # Delete blobs in target that are not in source, in batch requests
+            stale_blobs = sorted(target_blobs.keys() - target_names.values())
+            for blob_name in stale_blobs:
                 logger.info(f"Deleting {blob_name} from target")
-                delete_azure_blob(blob_name, AZURE_STORAGE_CONTAINER_NAME)
+            if stale_blobs:
+                operations.append(run(
+                    delete_azure_blobs_batch, stale_blobs, AZURE_STORAGE_CONTAINER_NAME, blob_service_client
+                ))
+
+            await asyncio.gather(*operations)
             
         logger.info("✅ Promotion completed successfully")
 
@@ -76,5 +121,18 @@ def promote_environment(
         logger.error(error_msg)
         raise AzureOperationError(error_msg)
 
+def promote_environment(
+    source_env: str = "dev",
+    target_env: str = "prod",
+    folder: str = "landing",
+) -> None:
+    """
+    Promote contents from source to target environment; see promote_environment_async.
+
+    Raises:
+        AzureOperationError: If promotion operation fails
+    """
+    asyncio.run(promote_environment_async(source_env, target_env, folder))
+
 if __name__ == "__main__":
     promote_environment()
@@ -4,26 +4,37 @@ This module provides functionality to sync SQLMesh database files with Azure Blo
 including downloading existing DBs and uploading updated ones.
 """
 
+import functools
 import os
 import sys
-from pathlib import Path
 from typing import Optional
 
 from azure.core.exceptions import ResourceNotFoundError
 
 from pipeline.exceptions import AzureOperationError
 from pipeline.logging_config import create_logger
-from pipeline.azure_config import AZURE_STORAGE_CONTAINER_NAME, ENABLE_AZURE_UPLOAD
-from pipeline.azure_utils import (
-    azure_blob_init,
-    download_file_from_azure_blob,
-    upload_file_to_azure_blob,
-    blob_exists
+from pipeline.azure_config import (
+    AZURE_DOWNLOAD_MAX_CONCURRENCY,
+    AZURE_STORAGE_CONTAINER_NAME,
+    AZURE_UPLOAD_MAX_CONCURRENCY,
+    ENABLE_AZURE_UPLOAD,
+    TARGET,
 )
+from pipeline.azure_utils import azure_blob_init
 from pipeline.local_storage import ensure_local_directories, get_local_paths
 
 logger = create_logger(__name__)
 
+# Only prod/qa targets may overwrite the shared DB in Azure
+_UPLOAD_ALLOWED = TARGET in {'prod', 'qa'}
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_local_directories_once() -> None:
+    """Create the local storage directories on the first call only."""
+    ensure_local_directories()
+
+
 def sync_db_with_azure_blob(operation: str, db_path: str, container_name: str, blob_key: str) -> None:
     """
     Sync SQLMesh database with Azure Blob Storage.
@@ -41,45 +52,55 @@ def sync_db_with_azure_blob(operation: str, db_path: str, container_name: str, b
         # Check if Azure upload is enabled
         if not ENABLE_AZURE_UPLOAD:
             logger.info("🏠 Azure upload disabled - using local storage only")
-            ensure_local_directories()
+            _ensure_local_directories_once()
             
             if operation == "download":
                 logger.info(f"📥 Local mode: Ensuring DB exists at: {db_path}")
-                # In local mode, just ensure the directory exists
+                # In local mode, just ensure the directory exists; the database
+                # library creates the file itself on first open
                 os.makedirs(os.path.dirname(db_path), exist_ok=True)
                 if not os.path.exists(db_path):
-                    logger.info("📝 Creating new empty database file for local mode")
-                    Path(db_path).touch()
+                    logger.info("📝 No local database yet, it will be created on first use")
                 logger.info(f"✅ Local DB ready at: {db_path}")
             elif operation == "upload":
                 logger.info(f"📤 Local mode: DB saved locally at: {db_path}")
                 logger.info(f"✅ Local storage operation completed")
             return
 
-        # Azure mode operations
+        # Azure mode operations share one blob client on the pooled service client
+        blob_client = azure_blob_init().get_container_client(container_name).get_blob_client(blob_key)
+
         if operation == "download":
             logger.info("Attempting to download DB from Azure Blob Storage...")
             try:
-                if blob_exists(blob_key, container_name):
-                    # File exists, download it
-                    os.makedirs(os.path.dirname(db_path), exist_ok=True)
-                    download_file_from_azure_blob(blob_key, db_path, container_name)
-                    logger.info("Successfully downloaded existing DB from Azure Blob Storage")
-                else:
-                    logger.info("No existing DB found in Azure Blob Storage, skipping download...")
-                    
+                # Start the download directly; a missing blob surfaces as
+                # ResourceNotFoundError, so no separate existence check is needed
+                downloader = blob_client.download_blob(max_concurrency=AZURE_DOWNLOAD_MAX_CONCURRENCY)
+            except ResourceNotFoundError:
+                logger.info("No existing DB found in Azure Blob Storage, skipping download...")
             except Exception as e:
                 raise AzureOperationError(f"Error checking Azure blob: {str(e)}")
+            else:
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+                with open(db_path, 'wb') as f:
+                    downloader.readinto(f)
+                logger.info("Successfully downloaded existing DB from Azure Blob Storage")
                     
         elif operation == "upload":
             # Only allow uploads in prod/qa environments
-            if os.getenv('TARGET', '').lower() not in ['prod', 'qa']:
+            if not _UPLOAD_ALLOWED:
                 logger.warning("Upload operation restricted to prod/qa targets only")
                 return
                 
             logger.info("Uploading DB to Azure Blob Storage...")
             if os.path.exists(db_path):
-                upload_file_to_azure_blob(db_path, blob_key, container_name)
+                with open(db_path, 'rb') as data:
+                    blob_client.upload_blob(
+                        data,
+                        length=os.fstat(data.fileno()).st_size,
+                        overwrite=True,
+                        max_concurrency=AZURE_UPLOAD_MAX_CONCURRENCY,
+                    )
                 logger.info("Successfully uploaded DB to Azure Blob Storage")
             else:
                 logger.warning(f"Local DB file not found at {db_path}, skipping upload")
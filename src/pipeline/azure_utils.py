@@ -5,27 +5,52 @@ replacing the AWS S3 utilities in the original application.
 """
 
 import os
-import tempfile
-from typing import Any, Optional, Tuple
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
 
-from azure.storage.blob import BlobServiceClient, BlobClient
-from azure.identity import DefaultAzureCredential, ClientSecretCredential
 from azure.core.exceptions import AzureError, ResourceNotFoundError
 
 from pipeline.azure_config import (
     AZURE_STORAGE_ACCOUNT_NAME,
     AZURE_STORAGE_CONTAINER_NAME,
     AZURE_STORAGE_CONNECTION_STRING,
+    AZURE_STORAGE_CONNECTION_PARTS,
     AZURE_CLIENT_ID,
     AZURE_CLIENT_SECRET,
     AZURE_TENANT_ID,
+    AZURE_BATCH_WORKERS,
+    AZURE_DOWNLOAD_MAX_CONCURRENCY,
+    AZURE_UPLOAD_MAX_CONCURRENCY,
+    ensure_azure_ready,
+    get_blob_service_client,
+    verify_client_access,
 )
+from pipeline.local_storage import ensure_parent_dir
 from pipeline.logging_config import create_logger
 from pipeline.exceptions import AzureOperationError
 
 logger = create_logger(__name__)
 
+# Container clients keyed by (service client, container name); blob clients
+# derived from them share the service client's HTTP pipeline
+_container_cache: Dict[Tuple[Any, str], Any] = {}
+
+# Blob URL prefix for the default container, resolved once from the account
+# name or the connection string
+_ACCOUNT_NAME = AZURE_STORAGE_ACCOUNT_NAME or AZURE_STORAGE_CONNECTION_PARTS.get("accountname")
+_URL_PREFIX = (
+    f"https://{_ACCOUNT_NAME}.blob.core.windows.net/{AZURE_STORAGE_CONTAINER_NAME}/"
+    if _ACCOUNT_NAME else None
+)
+
+# Most sub-requests the Blob service accepts in one batch request
+_DELETE_BATCH_SIZE = 256
+
+# Characters replaced with '_' by sanitize_filename
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
 
 def log_azure_initialization_error(error):
     """Log Azure initialization error with troubleshooting steps."""
@@ -41,55 +66,34 @@ def azure_blob_init(return_credential: bool = False) -> Tuple[Any, Optional[Any]
     """
     Initialize Azure Blob Service Client.
 
+    Returns the shared client from azure_config, so repeated calls reuse the same
+    HTTP pipeline and credential instead of constructing a new client each time.
+    With default credentials, access is verified once per client; a client
+    already probed by ensure_azure_ready() is not probed again.
+
     :param return_credential: If True, returns both client and credential
     :return: BlobServiceClient, and optionally the credential
     :raises AzureError: If Azure initialization fails
     """
-    logger = create_logger(__name__)
-
     try:
-        # Priority 1: Connection String
+        ensure_azure_ready()
+        blob_service_client = get_blob_service_client()
+
+        # Connection string clients carry an account key rather than a token credential
         if AZURE_STORAGE_CONNECTION_STRING:
             logger.info("Using Azure Storage Connection String")
-            blob_service_client = BlobServiceClient.from_connection_string(
-                AZURE_STORAGE_CONNECTION_STRING
-            )
             return (blob_service_client, None) if return_credential else blob_service_client
 
-        # Priority 2: Service Principal
+        credential = blob_service_client.credential
         if AZURE_CLIENT_ID and AZURE_CLIENT_SECRET and AZURE_TENANT_ID:
             logger.info("Using Azure Service Principal Credentials")
-            credential = ClientSecretCredential(
-                tenant_id=AZURE_TENANT_ID,
-                client_id=AZURE_CLIENT_ID,
-                client_secret=AZURE_CLIENT_SECRET
-            )
-            
-            if not AZURE_STORAGE_ACCOUNT_NAME:
-                raise ValueError("AZURE_STORAGE_ACCOUNT_NAME is required when using service principal")
-            
-            blob_service_client = BlobServiceClient(
-                account_url=f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
-                credential=credential
-            )
             return (blob_service_client, credential) if return_credential else blob_service_client
 
-        # Priority 3: Default Credentials
         logger.info("Using Default Azure Credentials")
-        credential = DefaultAzureCredential()
-        
-        if not AZURE_STORAGE_ACCOUNT_NAME:
-            raise ValueError("AZURE_STORAGE_ACCOUNT_NAME is required when using default credentials")
-        
-        blob_service_client = BlobServiceClient(
-            account_url=f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net",
-            credential=credential
-        )
 
-        # Verify Azure access
+        # Verify Azure access once per client rather than on every operation
         try:
-            blob_service_client.get_account_information()
-            logger.info("Azure Blob Service Client initialized successfully.")
+            verify_client_access(blob_service_client)
         except AzureError as access_error:
             logger.error(f"Azure Access Error: {access_error}")
             raise
@@ -102,6 +106,38 @@ def azure_blob_init(return_credential: bool = False) -> Tuple[Any, Optional[Any]
         raise
 
 
+def _get_container_client(container_name: Optional[str] = None,
+                          blob_service_client: Optional[Any] = None) -> Any:
+    """
+    Return a cached ContainerClient for the given container.
+
+    :param container_name: Container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
+    :return: ContainerClient for the container
+    """
+    blob_service_client = blob_service_client or azure_blob_init()
+    cache_key = (blob_service_client, container_name or AZURE_STORAGE_CONTAINER_NAME)
+    container_client = _container_cache.get(cache_key)
+    if container_client is None:
+        container_client = _container_cache.setdefault(
+            cache_key, blob_service_client.get_container_client(cache_key[1])
+        )
+    return container_client
+
+
+def _get_blob_client(blob_path: str, container_name: Optional[str] = None,
+                     blob_service_client: Optional[Any] = None) -> Any:
+    """
+    Return a BlobClient derived from the cached ContainerClient.
+
+    :param blob_path: Blob path in the container
+    :param container_name: Container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
+    :return: BlobClient for the blob
+    """
+    return _get_container_client(container_name, blob_service_client).get_blob_client(blob_path)
+
+
 def azure_blob_path_to_url(blob_path: str) -> str:
     """
     Convert Azure blob path to full URL.
@@ -109,40 +145,45 @@ def azure_blob_path_to_url(blob_path: str) -> str:
     :param blob_path: Blob path (e.g., 'dev/landing/data.parquet')
     :return: Full Azure blob URL
     """
-    if AZURE_STORAGE_ACCOUNT_NAME:
-        return f"https://{AZURE_STORAGE_ACCOUNT_NAME}.blob.core.windows.net/{AZURE_STORAGE_CONTAINER_NAME}/{blob_path}"
-    elif AZURE_STORAGE_CONNECTION_STRING:
-        # Extract account name from connection string
-        # This is a simplified approach - in production you might want more robust parsing
-        import re
-        match = re.search(r'AccountName=([^;]+)', AZURE_STORAGE_CONNECTION_STRING)
-        if match:
-            account_name = match.group(1)
-            return f"https://{account_name}.blob.core.windows.net/{AZURE_STORAGE_CONTAINER_NAME}/{blob_path}"
-    
-    raise ValueError("Unable to construct Azure blob URL - missing storage account information")
-
-
-def upload_file_to_azure_blob(local_file_path: str, blob_path: str, container_name: Optional[str] = None) -> None:
+    if _URL_PREFIX is None:
+        raise ValueError("Unable to construct Azure blob URL - missing storage account information")
+    return _URL_PREFIX + blob_path
+
+
+def upload_file_to_azure_blob(
+    local_file_path: str,
+    blob_path: str,
+    container_name: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    metadata: Optional[Dict[str, str]] = None,
+    blob_service_client: Optional[Any] = None
+) -> None:
     """
     Upload a local file to Azure Blob Storage.
     
+    Files larger than AZURE_MAX_SINGLE_PUT_SIZE are split into blocks that are
+    uploaded in parallel.
+    
     :param local_file_path: Local file path to upload
     :param blob_path: Blob path in the container
     :param container_name: Container name (uses default if None)
+    :param max_concurrency: Parallel block uploads (uses AZURE_UPLOAD_MAX_CONCURRENCY if None)
+    :param metadata: Optional metadata to set on the blob
+    :param blob_service_client: Client to use (uses the shared client if None)
     :raises AzureOperationError: If upload fails
     """
     try:
-        blob_service_client = azure_blob_init()
-        container = container_name or AZURE_STORAGE_CONTAINER_NAME
-        
-        blob_client = blob_service_client.get_blob_client(
-            container=container,
-            blob=blob_path
-        )
+        blob_client = _get_blob_client(blob_path, container_name, blob_service_client)
         
         with open(local_file_path, 'rb') as data:
-            blob_client.upload_blob(data, overwrite=True)
+            # Passing the length lets the SDK plan blocks without seeking the file
+            blob_client.upload_blob(
+                data,
+                length=os.fstat(data.fileno()).st_size,
+                overwrite=True,
+                metadata=metadata,
+                max_concurrency=max_concurrency or AZURE_UPLOAD_MAX_CONCURRENCY
+            )
         
         logger.info(f"Successfully uploaded {local_file_path} to Azure blob: {blob_path}")
         
@@ -152,29 +193,39 @@ def upload_file_to_azure_blob(local_file_path: str, blob_path: str, container_na
         raise AzureOperationError(error_msg)
 
 
-def download_file_from_azure_blob(blob_path: str, local_file_path: str, container_name: Optional[str] = None) -> None:
+def download_file_from_azure_blob(
+    blob_path: str,
+    local_file_path: str,
+    container_name: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    blob_service_client: Optional[Any] = None
+) -> None:
     """
     Download a file from Azure Blob Storage.
     
+    Large blobs are fetched as parallel ranged GETs and written straight into the
+    local file rather than buffered in memory.
+    
     :param blob_path: Blob path in the container
     :param local_file_path: Local file path to save to
     :param container_name: Container name (uses default if None)
+    :param max_concurrency: Parallel range requests (uses AZURE_DOWNLOAD_MAX_CONCURRENCY if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
     :raises AzureOperationError: If download fails
     """
     try:
-        blob_service_client = azure_blob_init()
-        container = container_name or AZURE_STORAGE_CONTAINER_NAME
+        blob_client = _get_blob_client(blob_path, container_name, blob_service_client)
         
-        blob_client = blob_service_client.get_blob_client(
-            container=container,
-            blob=blob_path
+        # Start the download first so a missing blob does not leave an empty local file
+        downloader = blob_client.download_blob(
+            max_concurrency=max_concurrency or AZURE_DOWNLOAD_MAX_CONCURRENCY
         )
         
         # Ensure local directory exists
-        os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
+        ensure_parent_dir(local_file_path)
         
         with open(local_file_path, 'wb') as download_file:
-            download_file.write(blob_client.download_blob().readall())
+            downloader.readinto(download_file)
         
         logger.info(f"Successfully downloaded Azure blob: {blob_path} to {local_file_path}")
         
@@ -187,19 +238,97 @@ def download_file_from_azure_blob(blob_path: str, local_file_path: str, containe
         raise AzureOperationError(error_msg)
 
 
-def list_azure_blobs(prefix: str = "", container_name: Optional[str] = None) -> list:
+def _run_batch(operation: Callable[..., None], pairs: List[Tuple[str, str]], description: str,
+               max_workers: Optional[int] = None, **kwargs) -> None:
+    """
+    Run a two-path blob operation for many files on a thread pool.
+
+    :param operation: Blob helper taking the two paths positionally
+    :param pairs: Positional path pairs passed to the operation
+    :param description: Operation name used in the error message
+    :param max_workers: Worker threads (uses AZURE_BATCH_WORKERS if None)
+    :param kwargs: Keyword arguments passed to every call
+    :raises AzureOperationError: If any transfer fails, after all have finished
+    """
+    if not pairs:
+        return
+
+    failures = []
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers or AZURE_BATCH_WORKERS, len(pairs)),
+        thread_name_prefix=f"azure-{description}",
+    ) as executor:
+        futures = {executor.submit(operation, *pair, **kwargs): pair for pair in pairs}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures.append(f"{futures[future][0]}: {e}")
+
+    if failures:
+        raise AzureOperationError(
+            f"Azure batch {description} failed for {len(failures)} of {len(pairs)} files: "
+            + "; ".join(failures)
+        )
+
+
+def upload_files_to_azure_blob(
+    pairs: Iterable[Tuple[str, str]],
+    container_name: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    max_concurrency: Optional[int] = None
+) -> None:
+    """
+    Upload many local files to Azure Blob Storage in parallel.
+
+    :param pairs: (local_file_path, blob_path) pairs
+    :param container_name: Container name (uses default if None)
+    :param max_workers: Files uploaded at once (uses AZURE_BATCH_WORKERS if None)
+    :param max_concurrency: Parallel block uploads per file (uses AZURE_UPLOAD_MAX_CONCURRENCY if None)
+    :raises AzureOperationError: If any upload fails
+    """
+    _run_batch(
+        upload_file_to_azure_blob, list(pairs), "upload", max_workers,
+        container_name=container_name, max_concurrency=max_concurrency,
+        blob_service_client=azure_blob_init(),
+    )
+
+
+def download_files_from_azure_blob(
+    pairs: Iterable[Tuple[str, str]],
+    container_name: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    max_concurrency: Optional[int] = None
+) -> None:
+    """
+    Download many blobs from Azure Blob Storage in parallel.
+
+    :param pairs: (blob_path, local_file_path) pairs
+    :param container_name: Container name (uses default if None)
+    :param max_workers: Files downloaded at once (uses AZURE_BATCH_WORKERS if None)
+    :param max_concurrency: Parallel range requests per file (uses AZURE_DOWNLOAD_MAX_CONCURRENCY if None)
+    :raises AzureOperationError: If any download fails
+    """
+    _run_batch(
+        download_file_from_azure_blob, list(pairs), "download", max_workers,
+        container_name=container_name, max_concurrency=max_concurrency,
+        blob_service_client=azure_blob_init(),
+    )
+
+
+def list_azure_blobs(prefix: str = "", container_name: Optional[str] = None,
+                     blob_service_client: Optional[Any] = None) -> list:
     """
     List blobs in Azure Blob Storage with optional prefix.
     
     :param prefix: Prefix to filter blobs
     :param container_name: Container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
     :return: List of blob names
     """
     try:
-        blob_service_client = azure_blob_init()
-        container = container_name or AZURE_STORAGE_CONTAINER_NAME
-        
-        blob_list = blob_service_client.get_container_client(container).list_blobs(name_starts_with=prefix)
+        container_client = _get_container_client(container_name, blob_service_client)
+        blob_list = container_client.list_blobs(name_starts_with=prefix)
         return [blob.name for blob in blob_list]
         
     except Exception as e:
@@ -208,22 +337,18 @@ def list_azure_blobs(prefix: str = "", container_name: Optional[str] = None) ->
         raise AzureOperationError(error_msg)
 
 
-def delete_azure_blob(blob_path: str, container_name: Optional[str] = None) -> None:
+def delete_azure_blob(blob_path: str, container_name: Optional[str] = None,
+                      blob_service_client: Optional[Any] = None) -> None:
     """
     Delete a blob from Azure Blob Storage.
     
     :param blob_path: Blob path in the container
     :param container_name: Container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
     :raises AzureOperationError: If deletion fails
     """
     try:
-        blob_service_client = azure_blob_init()
-        container = container_name or AZURE_STORAGE_CONTAINER_NAME
-        
-        blob_client = blob_service_client.get_blob_client(
-            container=container,
-            blob=blob_path
-        )
+        blob_client = _get_blob_client(blob_path, container_name, blob_service_client)
         
         blob_client.delete_blob()
         logger.info(f"Successfully deleted Azure blob: {blob_path}")
@@ -234,9 +359,54 @@ def delete_azure_blob(blob_path: str, container_name: Optional[str] = None) -> N
         raise AzureOperationError(error_msg)
 
 
+def delete_azure_blobs_batch(blob_paths: Iterable[str], container_name: Optional[str] = None,
+                             blob_service_client: Optional[Any] = None) -> int:
+    """
+    Delete many blobs using the Blob batch API, up to 256 per request.
+
+    Blobs that are already gone are not treated as failures.
+
+    :param blob_paths: Blob paths in the container
+    :param container_name: Container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
+    :return: Number of blobs deleted
+    :raises AzureOperationError: If any blob could not be deleted
+    """
+    blob_paths = list(blob_paths)
+    if not blob_paths:
+        return 0
+
+    try:
+        container_client = _get_container_client(container_name, blob_service_client)
+        deleted = 0
+        failures = []
+        for start in range(0, len(blob_paths), _DELETE_BATCH_SIZE):
+            chunk = blob_paths[start:start + _DELETE_BATCH_SIZE]
+            responses = container_client.delete_blobs(*chunk, raise_on_any_failure=False)
+            for blob_path, response in zip(chunk, responses):
+                if response.status_code == 202:
+                    deleted += 1
+                elif response.status_code != 404:
+                    failures.append(f"{blob_path}: HTTP {response.status_code} {response.reason}")
+
+    except Exception as e:
+        error_msg = f"Azure batch delete operation failed: {str(e)}"
+        logger.error(error_msg)
+        raise AzureOperationError(error_msg)
+
+    if failures:
+        error_msg = f"Azure batch delete failed for {len(failures)} of {len(blob_paths)} blobs: " + "; ".join(failures)
+        logger.error(error_msg)
+        raise AzureOperationError(error_msg)
+
+    logger.info(f"Successfully deleted {deleted} Azure blobs")
+    return deleted
+
+
 def copy_azure_blob(source_blob_path: str, dest_blob_path: str, 
                    source_container: Optional[str] = None, 
-                   dest_container: Optional[str] = None) -> None:
+                   dest_container: Optional[str] = None,
+                   blob_service_client: Optional[Any] = None) -> None:
     """
     Copy a blob within Azure Blob Storage.
     
@@ -244,22 +414,12 @@ def copy_azure_blob(source_blob_path: str, dest_blob_path: str,
     :param dest_blob_path: Destination blob path
     :param source_container: Source container name (uses default if None)
     :param dest_container: Destination container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
     :raises AzureOperationError: If copy fails
     """
     try:
-        blob_service_client = azure_blob_init()
-        source_cont = source_container or AZURE_STORAGE_CONTAINER_NAME
-        dest_cont = dest_container or AZURE_STORAGE_CONTAINER_NAME
-        
-        source_blob_client = blob_service_client.get_blob_client(
-            container=source_cont,
-            blob=source_blob_path
-        )
-        
-        dest_blob_client = blob_service_client.get_blob_client(
-            container=dest_cont,
-            blob=dest_blob_path
-        )
+        source_blob_client = _get_blob_client(source_blob_path, source_container, blob_service_client)
+        dest_blob_client = _get_blob_client(dest_blob_path, dest_container, blob_service_client)
         
         # Start the copy operation
         copy_source = source_blob_client.url
@@ -273,22 +433,83 @@ def copy_azure_blob(source_blob_path: str, dest_blob_path: str,
         raise AzureOperationError(error_msg)
 
 
-def blob_exists(blob_path: str, container_name: Optional[str] = None) -> bool:
+def _wait_for_copy(source_blob_path: str, dest_blob_path: str,
+                   dest_container: Optional[str] = None,
+                   blob_service_client: Optional[Any] = None,
+                   poll_interval: float = 1.0) -> None:
+    """
+    Poll a destination blob until its server-side copy has finished.
+
+    :param source_blob_path: Source blob path (only used in error messages)
+    :param dest_blob_path: Destination blob path
+    :param dest_container: Destination container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
+    :param poll_interval: Seconds between status checks
+    :raises AzureOperationError: If the copy failed or was aborted
+    """
+    blob_client = _get_blob_client(dest_blob_path, dest_container, blob_service_client)
+    while True:
+        copy = blob_client.get_blob_properties().copy
+        if copy.status != "pending":
+            break
+        time.sleep(poll_interval)
+
+    if copy.status not in (None, "success"):
+        raise AzureOperationError(
+            f"Copy from {source_blob_path} to {dest_blob_path} ended with status {copy.status}: "
+            f"{copy.status_description}"
+        )
+
+
+def copy_azure_blobs_batch(
+    pairs: Iterable[Tuple[str, str]],
+    source_container: Optional[str] = None,
+    dest_container: Optional[str] = None,
+    wait: bool = False,
+    max_workers: Optional[int] = None,
+    poll_interval: float = 1.0
+) -> None:
+    """
+    Start many server-side blob copies in parallel, optionally waiting for them.
+
+    All copies are started before any is polled, so the service copies them
+    concurrently; no data passes through this process.
+
+    :param pairs: (source_blob_path, dest_blob_path) pairs
+    :param source_container: Source container name (uses default if None)
+    :param dest_container: Destination container name (uses default if None)
+    :param wait: If True, poll until every copy has finished
+    :param max_workers: Requests in flight at once (uses AZURE_BATCH_WORKERS if None)
+    :param poll_interval: Seconds between status checks when waiting
+    :raises AzureOperationError: If any copy fails to start or, when waiting, to finish
+    """
+    pairs = list(pairs)
+    blob_service_client = azure_blob_init()
+    _run_batch(
+        copy_azure_blob, pairs, "copy", max_workers,
+        source_container=source_container, dest_container=dest_container,
+        blob_service_client=blob_service_client,
+    )
+    if wait:
+        _run_batch(
+            _wait_for_copy, pairs, "copy", max_workers,
+            dest_container=dest_container, blob_service_client=blob_service_client,
+            poll_interval=poll_interval,
+        )
+
+
+def blob_exists(blob_path: str, container_name: Optional[str] = None,
+                blob_service_client: Optional[Any] = None) -> bool:
     """
     Check if a blob exists in Azure Blob Storage.
     
     :param blob_path: Blob path in the container
     :param container_name: Container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
     :return: True if blob exists, False otherwise
     """
     try:
-        blob_service_client = azure_blob_init()
-        container = container_name or AZURE_STORAGE_CONTAINER_NAME
-        
-        blob_client = blob_service_client.get_blob_client(
-            container=container,
-            blob=blob_path
-        )
+        blob_client = _get_blob_client(blob_path, container_name, blob_service_client)
         
         blob_client.get_blob_properties()
         return True
@@ -300,6 +521,49 @@ def blob_exists(blob_path: str, container_name: Optional[str] = None) -> bool:
         raise AzureOperationError(f"Error checking blob existence: {e}")
 
 
+def blobs_exist_batch(blob_paths: Iterable[str], container_name: Optional[str] = None,
+                      blob_service_client: Optional[Any] = None) -> Dict[str, bool]:
+    """
+    Check whether many blobs exist with one listing per directory.
+
+    Paths are grouped by their parent directory. Each directory holding several
+    of the paths is listed once, without descending into subdirectories, and
+    membership is tested locally; a path alone in its directory gets a single
+    properties request instead. Unrelated paths therefore never trigger a
+    listing of the whole container.
+
+    :param blob_paths: Blob paths in the container
+    :param container_name: Container name (uses default if None)
+    :param blob_service_client: Client to use (uses the shared client if None)
+    :return: Mapping of blob path to whether it exists
+    :raises AzureOperationError: If a listing or check fails
+    """
+    by_directory: Dict[str, List[str]] = {}
+    for blob_path in blob_paths:
+        directory, sep, _ = blob_path.rpartition('/')
+        by_directory.setdefault(directory + sep, []).append(blob_path)
+    if not by_directory:
+        return {}
+
+    try:
+        container_client = _get_container_client(container_name, blob_service_client)
+        exists: Dict[str, bool] = {}
+        for prefix, paths in by_directory.items():
+            if len(paths) == 1:
+                exists[paths[0]] = blob_exists(paths[0], container_name, blob_service_client=blob_service_client)
+                continue
+            found = {item.name for item in container_client.walk_blobs(name_starts_with=prefix, delimiter='/')}
+            for blob_path in paths:
+                exists[blob_path] = blob_path in found
+        return exists
+
+    except AzureOperationError:
+        raise
+    except Exception as e:
+        logger.error(f"Error checking blob existence: {e}")
+        raise AzureOperationError(f"Error checking blob existence: {e}")
+
+
 # File path and naming utilities (keeping original functionality)
 def get_filename_from_path(file_path: str) -> str:
     """
@@ -329,13 +593,20 @@ def sanitize_filename(filename: str) -> str:
     :param filename: Original filename
     :return: Sanitized filename
     """
-    # Replace problematic characters
-    import re
-    sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
-    # Remove leading/trailing dots and spaces
-    sanitized = sanitized.strip('. ')
+    # Replace problematic characters and remove leading/trailing dots and spaces
+    sanitized = filename.translate(_SANITIZE_TABLE).strip('. ')
     # Limit length (Azure has a 1024 char limit for blob names)
     if len(sanitized) > 1000:
         name, ext = os.path.splitext(sanitized)
         sanitized = name[:1000-len(ext)] + ext
     return sanitized
+
+
+def duckdb_quote(value: str) -> str:
+    """
+    Quote a value as a DuckDB string literal.
+
+    :param value: Value to quote
+    :return: Single-quoted literal with embedded quotes escaped
+    """
+    return "'" + value.replace("'", "''") + "'"
@@ -109,3 +109,23 @@ class FileConversionError(IngestError):
     """
 
     pass
+
+
+class AuthenticationError(PipelineBaseError):
+    """
+    Raised when a user cannot be authenticated.
+
+    Covers issues such as:
+    - Invalid username or password
+    - Accounts locked after too many failed attempts
+    """
+
+    pass
+
+
+class AuthorizationError(PipelineBaseError):
+    """
+    Raised when an authenticated user lacks the required privileges.
+    """
+
+    pass
@@ -4,61 +4,105 @@ This module provides local file system operations when Azure Blob Storage
 is not configured or disabled.
 """
 
+import functools
 import os
 import shutil
 import logging
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Iterator, Mapping, Optional
 
 logger = logging.getLogger(__name__)
 
-def get_local_paths():
-    """Get local file system paths for data storage."""
+# Directories this process has already created
+_ensured_dirs: set = set()
+
+def _ensure_dir(path: Path) -> bool:
+    """Create a directory unless this process already did; returns True if mkdir ran."""
+    if path in _ensured_dirs:
+        return False
+    path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(path)
+    return True
+
+def ensure_parent_dir(file_path) -> None:
+    """Create the directory a file will be written to, once per process."""
+    _ensure_dir(Path(file_path).parent)
+
+@functools.lru_cache(maxsize=1)
+def get_local_paths() -> Mapping[str, str]:
+    """Get local file system paths for data storage.
+
+    Resolved on first call and cached; the mapping is read-only since it is shared.
+    """
     root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
     
-    return {
+    return MappingProxyType({
         'data_dir': os.path.join(root_dir, 'data'),
         'output_dir': os.path.join(root_dir, 'output'),
         'db_path': os.getenv('DB_PATH', os.path.join(root_dir, 'sqlMesh', 'unosaa_data_pipeline.db')),
         'raw_data_dir': os.getenv('RAW_DATA_DIR', os.path.join(root_dir, 'data', 'raw')),
         'staging_dir': os.path.join(root_dir, 'data', 'staging'),
         'master_dir': os.path.join(root_dir, 'data', 'master')
-    }
+    })
 
 def ensure_local_directories():
     """Ensure all required local directories exist."""
     paths = get_local_paths()
     
     for path_name, path in paths.items():
-        if path_name != 'db_path':  # DB path is a file, not directory
-            os.makedirs(path, exist_ok=True)
+        if path_name != 'db_path' and _ensure_dir(Path(path)):  # DB path is a file, not directory
             logger.info(f"📁 Ensured directory exists: {path}")
 
 def save_file_locally(file_path: str, content: bytes) -> str:
     """Save file content to local storage."""
     paths = get_local_paths()
-    full_path = os.path.join(paths['output_dir'], file_path)
+    full_path = Path(paths['output_dir'], file_path)
     
     # Ensure directory exists
-    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    ensure_parent_dir(full_path)
     
     with open(full_path, 'wb') as f:
         f.write(content)
     
     logger.info(f"💾 File saved locally: {full_path}")
-    return full_path
+    return str(full_path)
+
+def copy_file_locally(source_path: str, destination_path: str, preserve_metadata: bool = False) -> str:
+    """Copy file locally.
 
-def copy_file_locally(source_path: str, destination_path: str) -> str:
-    """Copy file locally."""
+    Only the contents are copied by default, which lets the kernel copy the data
+    directly; pass preserve_metadata=True to also keep permissions and timestamps.
+    """
     paths = get_local_paths()
-    full_dest_path = os.path.join(paths['output_dir'], destination_path)
+    full_dest_path = Path(paths['output_dir'], destination_path)
     
     # Ensure directory exists
-    os.makedirs(os.path.dirname(full_dest_path), exist_ok=True)
+    ensure_parent_dir(full_dest_path)
     
-    shutil.copy2(source_path, full_dest_path)
+    if preserve_metadata:
+        shutil.copy2(source_path, full_dest_path)
+    else:
+        shutil.copyfile(source_path, full_dest_path)
     logger.info(f"📋 File copied locally: {source_path} -> {full_dest_path}")
-    return full_dest_path
+    return str(full_dest_path)
+
+def _walk_files(path: str) -> Iterator[os.DirEntry]:
+    """Yield scandir entries for all files under path, using their cached types.
+
+    Like os.walk, symlinked directories are not followed and unreadable
+    directories are skipped.
+    """
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        yield from _walk_files(entry.path)
+                else:
+                    yield entry
+    except OSError:
+        return
 
 def list_local_files(directory: str = "") -> list:
     """List files in local storage."""
@@ -68,26 +112,51 @@ def list_local_files(directory: str = "") -> list:
     if not os.path.exists(base_path):
         return []
     
-    files = []
-    for root, dirs, filenames in os.walk(base_path):
-        for filename in filenames:
-            rel_path = os.path.relpath(os.path.join(root, filename), base_path)
-            files.append(rel_path)
-    
-    return files
+    # Entry paths all start with base_path, so slicing yields the relative path
+    base_len = len(os.path.join(base_path, ''))
+    return [entry.path[base_len:] for entry in _walk_files(base_path)]
 
 def get_local_file_info(file_path: str) -> Optional[dict]:
     """Get information about a local file."""
     paths = get_local_paths()
     full_path = os.path.join(paths['output_dir'], file_path)
     
-    if not os.path.exists(full_path):
+    try:
+        stat = os.stat(full_path)
+    except FileNotFoundError:
         return None
     
-    stat = os.stat(full_path)
     return {
         'name': file_path,
         'size': stat.st_size,
         'modified': stat.st_mtime,
         'path': full_path
     }
+
+def list_local_files_with_info(directory: str = "") -> list:
+    """List files in local storage with the same details as get_local_file_info.
+
+    Stats each entry found by the directory walk instead of resolving and
+    checking every name again.
+    """
+    paths = get_local_paths()
+    base_path = os.path.join(paths['output_dir'], directory)
+    
+    if not os.path.exists(base_path):
+        return []
+    
+    base_len = len(os.path.join(base_path, ''))
+    files = []
+    for entry in _walk_files(base_path):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue  # Dangling symlink
+        files.append({
+            'name': entry.path[base_len:],
+            'size': stat.st_size,
+            'modified': stat.st_mtime,
+            'path': entry.path
+        })
+    
+    return files
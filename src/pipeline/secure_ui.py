@@ -5,38 +5,120 @@ session management, and security features.
 """
 
 import os
+import gzip
+import hashlib
 import logging
-from flask import Flask, request, render_template_string, redirect, url_for, session, jsonify, make_response
-from werkzeug.exceptions import Unauthorized, Forbidden
-import uuid
+import threading
+from cachetools import TTLCache
+from flask import Flask, request, render_template, redirect, url_for, jsonify, make_response, g
+from pathlib import Path
+from datetime import datetime
+import orjson
+from flask.json.provider import DefaultJSONProvider
 
 from pipeline.auth import (
     authenticate_user, validate_session, logout_user, 
-    get_security_status, cleanup_expired_sessions,
-    AuthenticationError, AuthorizationError
+    get_security_status, load_or_create_secret,
+    AuthenticationError
 )
 
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson; types orjson can't encode fall back to Flask's defaults."""
+
+    # Datetimes are passed through so they keep Flask's HTTP-date format
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _dumps_bytes(self, obj, option=0):
+        return orjson.dumps(obj, default=self.default, option=self.options | option)
+
+    def dumps(self, obj, **kwargs):
+        return self._dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(self._dumps_bytes(obj, option), mimetype=self.mimetype)
+
 app = Flask(__name__)
-app.secret_key = os.getenv('FLASK_SECRET_KEY', str(uuid.uuid4()))
+app.json = OrjsonProvider(app)
+# Serve /pipeline/ and /pipeline alike instead of redirecting
+app.url_map.strict_slashes = False
+
+# The stylesheet URL carries a content hash, so browsers may cache it indefinitely
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 365 * 24 * 3600
+with open(os.path.join(app.static_folder, 'app.css'), 'rb') as _css:
+    _CSS_VERSION = hashlib.blake2b(_css.read(), digest_size=8).hexdigest()
+
+@app.context_processor
+def inject_css_version():
+    """Expose the stylesheet version for cache-busting URLs."""
+    return {'css_version': _CSS_VERSION}
+
+
+# Shared by every worker and kept across restarts, so signed cookies stay valid
+app.secret_key = load_or_create_secret('FLASK_SECRET_KEY', Path.home() / '.osaa' / 'flask_secret_key')
+
+# Recent successful session validations keyed by (token, client IP); a hit skips the
+# JWT verification and session store lookup. Logouts in another process take effect
+# here within SESSION_CACHE_TTL seconds
+SESSION_CACHE_TTL = int(os.getenv('SESSION_CACHE_TTL_SECONDS', '30'))
+_session_cache = TTLCache(maxsize=10_000, ttl=SESSION_CACHE_TTL)
+_session_cache_lock = threading.Lock()
+
+# Fixed /api/run-pipeline errors, serialized once. Each request still gets its own
+# Response, since after_request handlers and the session cookie modify it
+_ALLOWED_OPERATIONS = frozenset({'ingest', 'transform', 'etl', 'promote', 'config_test'})
+_ERR_NO_OPERATION = b'{"error":"Operation is required"}'
+_ERR_INVALID_OPERATION = b'{"error":"Invalid operation"}'
+
+def _json_error(body, status):
+    """Build a JSON error response from a pre-serialized body."""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+# Security headers, identical for every response
+_SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block',
+    'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
+    'Content-Security-Policy': "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'",
+}
 
-# Security headers
 @app.after_request
 def after_request(response):
     """Add security headers to all responses."""
-    response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['X-Frame-Options'] = 'DENY'
-    response.headers['X-XSS-Protection'] = '1; mode=block'
-    response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
-    response.headers['Content-Security-Policy'] = "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'"
+    response.headers.update(_SECURITY_HEADERS)
     return response
 
 def get_client_ip():
-    """Get client IP address."""
-    if request.headers.get('X-Forwarded-For'):
-        return request.headers.get('X-Forwarded-For').split(',')[0].strip()
-    return request.remote_addr
+    """Get client IP address, resolved once per request."""
+    ip = g.get('client_ip')
+    if ip is None:
+        forwarded_for = request.headers.get('X-Forwarded-For')
+        ip = forwarded_for.split(',', 1)[0].strip() if forwarded_for else request.remote_addr
+        g.client_ip = ip
+    return ip
+
+def validate_session_cached(token, ip_address):
+    """Validate a session token, reusing a recent successful validation."""
+    key = (token, ip_address)
+    with _session_cache_lock:
+        user_info = _session_cache.get(key)
+    if user_info is not None:
+        return user_info
+    
+    user_info = validate_session(token, ip_address)
+    if user_info:
+        with _session_cache_lock:
+            _session_cache[key] = user_info
+    return user_info
 
 def require_login(f):
     """Decorator to require login for routes."""
@@ -48,7 +130,7 @@ def require_login(f):
         if not token:
             return redirect(url_for('login'))
         
-        user_info = validate_session(token, get_client_ip())
+        user_info = validate_session_cached(token, get_client_ip())
         if not user_info:
             response = make_response(redirect(url_for('login')))
             response.set_cookie('auth_token', '', expires=0)
@@ -60,6 +142,26 @@ def require_login(f):
     
     return decorated_function
 
+# The login form without an error message is the same for every visitor: render it
+# once per script root and keep a gzip copy alongside
+_login_page_cache = {}
+
+def _login_page_response():
+    """Serve the cached login form, gzip-encoded when the client accepts it."""
+    page = _login_page_cache.get(request.script_root)
+    if page is None:
+        html = render_template(_LOGIN_TEMPLATE).encode('utf-8')
+        page = _login_page_cache[request.script_root] = (html, gzip.compress(html, compresslevel=9))
+    
+    html, html_gz = page
+    if request.accept_encodings['gzip']:
+        response = app.response_class(html_gz, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(html, mimetype='text/html')
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/login', methods=['GET', 'POST'])
 def login():
     """Login page."""
@@ -68,7 +170,7 @@ def login():
         password = request.form.get('password', '')
         
         if not username or not password:
-            return render_template_string(LOGIN_TEMPLATE, error="Username and password are required")
+            return render_template(_LOGIN_TEMPLATE, error="Username and password are required")
         
         try:
             token = authenticate_user(username, password, get_client_ip())
@@ -77,27 +179,29 @@ def login():
             return response
         
         except AuthenticationError as e:
-            logger.warning(f"Failed login attempt for {username} from {get_client_ip()}: {e}")
-            return render_template_string(LOGIN_TEMPLATE, error=str(e))
+            logger.warning("Failed login attempt for %s from %s: %s", username, get_client_ip(), e)
+            return render_template(_LOGIN_TEMPLATE, error=str(e))
         
         except Exception as e:
-            logger.error(f"Login error: {e}")
-            return render_template_string(LOGIN_TEMPLATE, error="An error occurred during login")
+            logger.error("Login error: %s", e)
+            return render_template(_LOGIN_TEMPLATE, error="An error occurred during login")
     
-    return render_template_string(LOGIN_TEMPLATE)
+    return _login_page_response()
 
 @app.route('/logout')
 def logout():
     """Logout and clear session."""
     token = request.cookies.get('auth_token')
     if token:
+        with _session_cache_lock:
+            _session_cache.pop((token, get_client_ip()), None)
         try:
             user_info = validate_session(token, get_client_ip())
             if user_info:
                 logout_user(user_info['session_id'])
-                logger.info(f"User {user_info['username']} logged out")
+                logger.info("User %s logged out", user_info['username'])
         except Exception as e:
-            logger.error(f"Logout error: {e}")
+            logger.error("Logout error: %s", e)
     
     response = make_response(redirect(url_for('login')))
     response.set_cookie('auth_token', '', expires=0)
@@ -107,48 +211,49 @@ def logout():
 @require_login
 def dashboard():
     """Main dashboard."""
-    return render_template_string(DASHBOARD_TEMPLATE, user=request.user_info)
+    return render_template(_DASHBOARD_TEMPLATE, user=request.user_info)
 
 @app.route('/pipeline')
 @require_login
 def pipeline():
     """Pipeline management interface."""
-    return render_template_string(PIPELINE_TEMPLATE, user=request.user_info)
+    return render_template(_PIPELINE_TEMPLATE, user=request.user_info)
 
 @app.route('/security')
 @require_login
 def security():
     """Security status and monitoring."""
     security_status = get_security_status()
-    return render_template_string(SECURITY_TEMPLATE, user=request.user_info, status=security_status)
+    return render_template(_SECURITY_TEMPLATE, user=request.user_info, status=security_status)
 
 @app.route('/api/run-pipeline', methods=['POST'])
 @require_login
 def run_pipeline():
     """API endpoint to run pipeline operations."""
     try:
-        operation = request.json.get('operation')
+        # A missing or malformed JSON body is treated as an empty one
+        data = request.get_json(silent=True)
+        operation = data.get('operation') if isinstance(data, dict) else None
         if not operation:
-            return jsonify({'error': 'Operation is required'}), 400
+            return _json_error(_ERR_NO_OPERATION, 400)
         
         # Validate operation
-        allowed_operations = ['ingest', 'transform', 'etl', 'promote', 'config_test']
-        if operation not in allowed_operations:
-            return jsonify({'error': 'Invalid operation'}), 400
+        if not isinstance(operation, str) or operation not in _ALLOWED_OPERATIONS:
+            return _json_error(_ERR_INVALID_OPERATION, 400)
         
         # Here you would execute the actual pipeline operation
         # For now, we'll just return a success message
-        logger.info(f"User {request.user_info['username']} requested operation: {operation}")
+        logger.info("User %s requested operation: %s", request.user_info['username'], operation)
         
         return jsonify({
             'success': True,
             'message': f'Pipeline operation "{operation}" initiated',
             'operation': operation,
-            'timestamp': str(datetime.utcnow())
+            'timestamp': datetime.utcnow().isoformat()
         })
     
     except Exception as e:
-        logger.error(f"Pipeline execution error: {e}")
+        logger.error("Pipeline execution error: %s", e)
         return jsonify({'error': 'Pipeline execution failed'}), 500
 
 # HTML Templates
@@ -159,20 +264,9 @@ LOGIN_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>OSAA MVP - Login</title>
-    <style>
-        body { font-family: Arial, sans-serif; background: #f5f5f5; margin: 0; padding: 0; }
-        .container { max-width: 400px; margin: 100px auto; background: white; padding: 30px; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
-        h1 { text-align: center; color: #333; margin-bottom: 30px; }
-        .form-group { margin-bottom: 20px; }
-        label { display: block; margin-bottom: 5px; color: #555; }
-        input[type="text"], input[type="password"] { width: 100%; padding: 10px; border: 1px solid #ddd; border-radius: 4px; box-sizing: border-box; }
-        button { width: 100%; padding: 12px; background: #007cba; color: white; border: none; border-radius: 4px; cursor: pointer; font-size: 16px; }
-        button:hover { background: #005a87; }
-        .error { color: #d32f2f; background: #ffebee; padding: 10px; border-radius: 4px; margin-bottom: 20px; }
-        .security-info { margin-top: 20px; padding: 15px; background: #e3f2fd; border-radius: 4px; font-size: 14px; color: #1976d2; }
-    </style>
+    <link rel="stylesheet" href="{{ url_for('static', filename='app.css', v=css_version) }}">
 </head>
-<body>
+<body class="login-page">
     <div class="container">
         <h1>🔐 OSAA MVP Access</h1>
         {% if error %}
@@ -205,19 +299,9 @@ DASHBOARD_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>OSAA MVP - Dashboard</title>
-    <style>
-        body { font-family: Arial, sans-serif; background: #f5f5f5; margin: 0; padding: 0; }
-        .header { background: #1976d2; color: white; padding: 20px; }
-        .container { max-width: 1200px; margin: 20px auto; padding: 0 20px; }
-        .nav { background: white; padding: 15px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .nav a { margin-right: 20px; text-decoration: none; color: #1976d2; font-weight: bold; }
-        .nav a:hover { text-decoration: underline; }
-        .card { background: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .user-info { float: right; color: white; }
-        .logout { color: #ffcdd2; }
-    </style>
+    <link rel="stylesheet" href="{{ url_for('static', filename='app.css', v=css_version) }}">
 </head>
-<body>
+<body class="dashboard-page">
     <div class="header">
         <h1>OSAA MVP Dashboard</h1>
         <div class="user-info">
@@ -280,21 +364,9 @@ PIPELINE_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>OSAA MVP - Pipeline Management</title>
-    <style>
-        body { font-family: Arial, sans-serif; background: #f5f5f5; margin: 0; padding: 0; }
-        .header { background: #1976d2; color: white; padding: 20px; }
-        .container { max-width: 1200px; margin: 20px auto; padding: 0 20px; }
-        .nav { background: white; padding: 15px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .nav a { margin-right: 20px; text-decoration: none; color: #1976d2; font-weight: bold; }
-        .card { background: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .pipeline-op { margin: 10px 0; padding: 15px; border: 1px solid #ddd; border-radius: 4px; }
-        button { padding: 10px 20px; background: #007cba; color: white; border: none; border-radius: 4px; cursor: pointer; margin: 5px; }
-        button:hover { background: #005a87; }
-        .danger { background: #d32f2f; }
-        .danger:hover { background: #b71c1c; }
-    </style>
+    <link rel="stylesheet" href="{{ url_for('static', filename='app.css', v=css_version) }}">
 </head>
-<body>
+<body class="pipeline-page">
     <div class="header">
         <h1>Pipeline Management</h1>
         <div class="user-info">
@@ -373,19 +445,9 @@ SECURITY_TEMPLATE = """
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>OSAA MVP - Security</title>
-    <style>
-        body { font-family: Arial, sans-serif; background: #f5f5f5; margin: 0; padding: 0; }
-        .header { background: #1976d2; color: white; padding: 20px; }
-        .container { max-width: 1200px; margin: 20px auto; padding: 0 20px; }
-        .nav { background: white; padding: 15px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .nav a { margin-right: 20px; text-decoration: none; color: #1976d2; font-weight: bold; }
-        .card { background: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .status-item { padding: 10px; margin: 5px 0; border-left: 4px solid #4caf50; background: #f1f8e9; }
-        .warning { border-left-color: #ff9800; background: #fff3e0; }
-        .danger { border-left-color: #f44336; background: #ffebee; }
-    </style>
+    <link rel="stylesheet" href="{{ url_for('static', filename='app.css', v=css_version) }}">
 </head>
-<body>
+<body class="security-page">
     <div class="header">
         <h1>Security Dashboard</h1>
         <div class="user-info">
@@ -404,11 +466,11 @@ SECURITY_TEMPLATE = """
             <h2>Security Status</h2>
             
             <div class="status-item">
-                <strong>Active Sessions:</strong> {{ status.active_sessions }}
+                <strong>Active Sessions:</strong> {{ status.active_sessions if status.active_sessions is not none else 'not tracked (shared store)' }}
             </div>
             
             <div class="status-item">
-                <strong>Total Sessions:</strong> {{ status.total_sessions }}
+                <strong>Total Sessions:</strong> {{ status.total_sessions if status.total_sessions is not none else 'not tracked (shared store)' }}
             </div>
             
             <div class="status-item {% if status.failed_login_attempts > 0 %}warning{% endif %}">
@@ -450,18 +512,14 @@ SECURITY_TEMPLATE = """
 </html>
 """
 
+# Compile the templates once; render_template accepts compiled templates and still
+# applies the app's context processors, unlike calling Template.render directly
+_LOGIN_TEMPLATE = app.jinja_env.from_string(LOGIN_TEMPLATE)
+_DASHBOARD_TEMPLATE = app.jinja_env.from_string(DASHBOARD_TEMPLATE)
+_PIPELINE_TEMPLATE = app.jinja_env.from_string(PIPELINE_TEMPLATE)
+_SECURITY_TEMPLATE = app.jinja_env.from_string(SECURITY_TEMPLATE)
+
 if __name__ == '__main__':
-    # Cleanup expired sessions periodically
-    import threading
-    import time
-    
-    def cleanup_sessions():
-        while True:
-            time.sleep(300)  # Cleanup every 5 minutes
-            cleanup_expired_sessions()
-    
-    cleanup_thread = threading.Thread(target=cleanup_sessions, daemon=True)
-    cleanup_thread.start()
-    
-    # Run the secure web interface
+    # Local development server; deployments serve pipeline.wsgi:app with Gunicorn.
+    # Expired sessions are dropped by the session store's TTLs, no cleanup thread needed
     app.run(host='0.0.0.0', port=8080, debug=False)
@@ -0,0 +1,143 @@
+"""Session storage backends for the OSAA MVP authentication module.
+
+Sessions are kept in Redis when REDIS_URL is configured, so they survive process
+restarts and are shared between instances; logging out deletes the key, which
+revokes the token immediately. Without REDIS_URL a bounded in-process TTL cache
+is used. Session ids are hex strings; the in-process store keys on their raw bytes.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional
+
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL')
+SESSION_KEY_PREFIX = 'session:'
+MAX_IN_MEMORY_SESSIONS = int(os.getenv('MAX_IN_MEMORY_SESSIONS', '100000'))
+
+
+class InMemorySessionStore:
+    """Process-local session store used when Redis is not configured.
+
+    Backed by a TTLCache, so expired sessions are evicted automatically and the
+    number of stored sessions is bounded. TTLCache is not thread-safe (even reads
+    expire entries), so every access holds a lock.
+    """
+
+    def __init__(self, ttl_seconds: int, maxsize: int = MAX_IN_MEMORY_SESSIONS) -> None:
+        self._sessions: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(session_id: str) -> Optional[bytes]:
+        try:
+            return bytes.fromhex(session_id)
+        except ValueError:
+            return None
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session data, or None if the session does not exist or expired."""
+        key = self._key(session_id)
+        with self._lock:
+            return self._sessions.get(key)
+
+    def set(self, session_id: str, data: Dict[str, Any], ttl_seconds: int) -> None:
+        """Store a new session; the cache-wide TTL applies."""
+        key = self._key(session_id)
+        with self._lock:
+            self._sessions[key] = data
+
+    def touch(self, session_id: str, data: Dict[str, Any]) -> None:
+        """No-op: session dicts are stored by reference, and re-inserting would extend the TTL."""
+
+    def delete(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a session and return its data, if it existed."""
+        key = self._key(session_id)
+        with self._lock:
+            return self._sessions.pop(key, None)
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all stored sessions."""
+        with self._lock:
+            return iter(list(self._sessions.values()))
+
+    def count(self) -> Optional[int]:
+        """Return the number of stored sessions."""
+        with self._lock:
+            return len(self._sessions)
+
+
+class RedisSessionStore:
+    """Redis-backed session store; keys expire through Redis TTLs."""
+
+    def __init__(self, url: str) -> None:
+        import redis
+
+        self._redis = redis.Redis(connection_pool=redis.ConnectionPool.from_url(url))
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"{SESSION_KEY_PREFIX}{session_id}"
+
+    @staticmethod
+    def _serialize(data: Dict[str, Any]) -> str:
+        return json.dumps(data)
+
+    @staticmethod
+    def _deserialize(raw: bytes) -> Dict[str, Any]:
+        return json.loads(raw)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Return the session data, or None if the key is missing or expired."""
+        raw = self._redis.get(self._key(session_id))
+        return self._deserialize(raw) if raw is not None else None
+
+    def set(self, session_id: str, data: Dict[str, Any], ttl_seconds: int) -> None:
+        """Store a new session with SETEX so Redis expires it automatically."""
+        self._redis.setex(self._key(session_id), ttl_seconds, self._serialize(data))
+
+    def touch(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Persist updated session data, keeping the existing TTL."""
+        self._redis.set(self._key(session_id), self._serialize(data), keepttl=True, xx=True)
+
+    def delete(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a session and return its data, if it existed."""
+        raw = self._redis.getdel(self._key(session_id))
+        return self._deserialize(raw) if raw is not None else None
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all stored sessions."""
+        for key in self._redis.scan_iter(match=f"{SESSION_KEY_PREFIX}*"):
+            raw = self._redis.get(key)
+            if raw is not None:
+                yield self._deserialize(raw)
+
+    def count(self) -> Optional[int]:
+        """Not tracked: counting would mean scanning the whole keyspace."""
+        return None
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store(ttl_seconds: int):
+    """Return the process-wide session store, creating it on first use.
+
+    :param ttl_seconds: Session lifetime, used to size the in-memory TTL cache
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            if REDIS_URL:
+                logger.info("Using Redis session store")
+                _store = RedisSessionStore(REDIS_URL)
+            else:
+                logger.info("REDIS_URL not set, using in-memory session store")
+                _store = InMemorySessionStore(ttl_seconds)
+    return _store
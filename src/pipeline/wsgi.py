@@ -0,0 +1,12 @@
+"""WSGI entry point for serving the secure web interface under Gunicorn.
+
+Example:
+    gunicorn -k gthread -w 3 --threads 4 --bind 0.0.0.0:8080 --access-logfile - pipeline.wsgi:app
+
+Request access lines come from Gunicorn's access log; the application logs only
+authentication and pipeline events.
+"""
+
+from pipeline.secure_ui import app
+
+__all__ = ['app']
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 
+import io
 import os
 import logging
+from itertools import islice
 from datetime import datetime
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import tempfile
+import orjson
 from dotenv import load_dotenv
 
 # Set up logging
@@ -16,22 +20,29 @@ env_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
 logger.info(f"Loading .env file from: {env_path}")
 load_dotenv(env_path, override=True)
 
+# Same transfer settings as the pipeline (see pipeline.azure_config)
+AZURE_UPLOAD_MAX_CONCURRENCY = int(os.getenv('AZURE_UPLOAD_MAX_CONCURRENCY', '8'))
+AZURE_MAX_SINGLE_PUT_SIZE = int(os.getenv('AZURE_MAX_SINGLE_PUT_SIZE', str(4 * 1024 * 1024)))
+AZURE_MAX_BLOCK_SIZE = int(os.getenv('AZURE_MAX_BLOCK_SIZE', str(8 * 1024 * 1024)))
+AZURE_DOWNLOAD_MAX_CONCURRENCY = int(os.getenv('AZURE_DOWNLOAD_MAX_CONCURRENCY', '8'))
+
 def create_test_parquet():
     """Create a test Parquet file with sample data"""
-    # Create sample data
-    data = {
-        'id': range(1, 6),
-        'name': ['Test1', 'Test2', 'Test3', 'Test4', 'Test5'],
-        'value': [10.5, 20.0, 30.7, 40.2, 50.9],
-        'timestamp': [datetime.now()] * 5
-    }
-    df = pd.DataFrame(data)
+    # Create sample data as typed Arrow columns, skipping pandas' dtype inference
+    now = datetime.now()
+    table = pa.table({
+        'id': pa.array(range(1, 6), pa.int64()),
+        'name': pa.array(['Test1', 'Test2', 'Test3', 'Test4', 'Test5'], pa.string()),
+        'value': pa.array([10.5, 20.0, 30.7, 40.2, 50.9], pa.float64()),
+        'timestamp': pa.array([now] * 5, pa.timestamp('us'))
+    })
     
     # Create a temporary file
     temp_file = tempfile.NamedTemporaryFile(suffix='.parquet', delete=False)
+    temp_file.close()
     
-    # Write DataFrame to Parquet file
-    df.to_parquet(temp_file.name, engine='pyarrow')
+    # Write the table to a Parquet file
+    pq.write_table(table, temp_file.name, compression='zstd')
     
     return temp_file.name
 
@@ -41,6 +52,9 @@ def test_azure_credentials():
         from azure.storage.blob import BlobServiceClient
         from azure.identity import DefaultAzureCredential, ClientSecretCredential
         from azure.core.exceptions import AzureError, ResourceNotFoundError
+        from azure.core.pipeline.transport import RequestsTransport
+        import requests
+        from requests.adapters import HTTPAdapter
         
         logger.info("Testing Azure credentials...")
         
@@ -57,23 +71,38 @@ def test_azure_credentials():
         logger.info(f"Client ID: {'*' * 16 + client_id[-4:] if client_id else 'Not Set'}")
         logger.info(f"Tenant ID: {tenant_id}")
         
-        # Initialize blob service client
+        # One keep-alive session for every check below, with enough pooled
+        # connections for the parallel block upload
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(AZURE_UPLOAD_MAX_CONCURRENCY, 10))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
+        # Initialize blob service client; files above the single-put size are
+        # uploaded as blocks in parallel
+        client_kwargs = {
+            'transport': RequestsTransport(session=session),
+            'max_single_put_size': AZURE_MAX_SINGLE_PUT_SIZE,
+            'max_block_size': AZURE_MAX_BLOCK_SIZE,
+        }
         if connection_string:
             logger.info("Using connection string authentication")
-            blob_service_client = BlobServiceClient.from_connection_string(connection_string)
+            blob_service_client = BlobServiceClient.from_connection_string(connection_string, **client_kwargs)
         elif client_id and client_secret and tenant_id:
             logger.info("Using service principal authentication")
             credential = ClientSecretCredential(tenant_id, client_id, client_secret)
             blob_service_client = BlobServiceClient(
                 account_url=f"https://{account_name}.blob.core.windows.net",
-                credential=credential
+                credential=credential,
+                **client_kwargs
             )
         else:
             logger.info("Using default Azure credentials")
             credential = DefaultAzureCredential()
             blob_service_client = BlobServiceClient(
                 account_url=f"https://{account_name}.blob.core.windows.net",
-                credential=credential
+                credential=credential,
+                **client_kwargs
             )
         
         # Test connection by getting account information
@@ -109,8 +138,9 @@ def test_azure_credentials():
         
         # Test listing blobs
         logger.info(f"\nTesting blob listing with prefix: {base_path}")
-        blob_list = container_client.list_blobs(name_starts_with=base_path, max_page_size=5)
-        blob_names = [blob.name for blob in blob_list]
+        # Only the first few names are shown, so stop after the first page
+        blob_list = container_client.list_blobs(name_starts_with=base_path, results_per_page=5)
+        blob_names = [blob.name for blob in islice(blob_list, 5)]
         
         if blob_names:
             logger.info("Found existing blobs:")
@@ -128,12 +158,11 @@ def test_azure_credentials():
             'username': username
         }
         
-        import json
         test_key = f"{base_path}/credentials_test.json"
         
         logger.info(f"Attempting to write test file to blob: {test_key}")
         blob_client = container_client.get_blob_client(test_key)
-        blob_client.upload_blob(json.dumps(test_data), overwrite=True)
+        blob_client.upload_blob(orjson.dumps(test_data), overwrite=True)
         logger.info("Successfully wrote test file to Azure Blob Storage")
         
         # Verify the file was written
@@ -141,9 +170,11 @@ def test_azure_credentials():
         blob_properties = blob_client.get_blob_properties()
         logger.info(f"Test file verified (size: {blob_properties.size} bytes, last modified: {blob_properties.last_modified})")
         
-        # Read back the contents
-        blob_data = blob_client.download_blob().readall()
-        data = json.loads(blob_data.decode('utf-8'))
+        # Read back the contents straight into a buffer sized from the properties above,
+        # as the pipeline's downloads do
+        buffer = io.BytesIO(bytearray(blob_properties.size))
+        blob_client.download_blob(max_concurrency=AZURE_DOWNLOAD_MAX_CONCURRENCY).readinto(buffer)
+        data = orjson.loads(buffer.getbuffer())
         logger.info(f"File contents: {data}")
         
         # Test Parquet file upload
@@ -154,7 +185,13 @@ def test_azure_credentials():
         logger.info(f"Uploading Parquet file to blob: {parquet_key}")
         parquet_blob_client = container_client.get_blob_client(parquet_key)
         with open(parquet_file, 'rb') as f:
-            parquet_blob_client.upload_blob(f, overwrite=True)
+            parquet_blob_client.upload_blob(
+                f,
+                overwrite=True,
+                blob_type='BlockBlob',
+                length=os.fstat(f.fileno()).st_size,
+                max_concurrency=AZURE_UPLOAD_MAX_CONCURRENCY
+            )
         logger.info("Successfully uploaded Parquet file")
         
         # Clean up temporary file